@@ -1,23 +1,68 @@
 import streamlit as st
 import sys
 import os
+import time
 
 # Add src directory to Python path
 sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
 
+from src.components.job_manager import JobManager, SummaryJob
 from src.components.resume_summarizer import ResumeSummarizer
 from src.components.summary_result import SummaryResult
 from src.components.ui import UI
 from src.components.file_handler import FileHandler
 from src.components.progress_tracker import ProgressTracker
 from src.utils.css_styler import CSSStyler
+from src.utils.metrics import metrics_registry, start_metrics_server
 from src.utils.validation_utils import ValidationUtils
 from src.utils.settings_loader import SettingsLoader
+from src.utils.summary_cache import SummaryCache
+
+@st.cache_resource(show_spinner=False)
+def get_settings_loader() -> SettingsLoader:
+    """Process-wide settings loader, so reruns reuse the parsed settings."""
+    return SettingsLoader()
+
+
+@st.cache_resource(show_spinner=False, max_entries=1)
+def get_shared_summarizer(settings_version: int) -> ResumeSummarizer:
+    """
+    Process-wide summarizer, rebuilt only when settings.json changes.
+    
+    Args:
+        settings_version: Settings file version the summarizer is built from
+    """
+    summarizer = ResumeSummarizer(settings=settings_loader.load_settings())
+    summarizer.warm_up_in_background()
+    return summarizer
+
+
+@st.cache_resource(show_spinner=False)
+def get_job_manager() -> JobManager:
+    """Process-wide job store, so summaries outlive reruns and reconnecting sessions."""
+    job_settings = settings_loader.get_job_settings(settings_loader.load_settings())
+    return JobManager(
+        max_workers=job_settings.get('workers', 2),
+        result_ttl=job_settings.get('result_ttl', 3600)
+    )
+
+
+@st.cache_resource(show_spinner=False)
+def cleanup_stale_uploads(max_age_hours: float) -> int:
+    """Once per process, remove upload files left in the temp directory by earlier crashes."""
+    return FileHandler.cleanup_stale_temp_files(max_age_hours)
+
+
+@st.cache_resource(show_spinner=False)
+def start_metrics_export(port: int, host: str = "127.0.0.1"):
+    """Start the metrics endpoint once per process."""
+    return start_metrics_server(port, host)
+
 
 # Global instances
 css_styler = CSSStyler()
 validator = ValidationUtils()
-settings_loader = SettingsLoader()
+settings_loader = get_settings_loader()
 
 
 class ResumeSummarizerApp:
@@ -43,12 +88,25 @@ class ResumeSummarizerApp:
         # Load settings from external file
         self.settings = settings_loader.load_settings()
         
-        # Initialize summarizer with settings
-        self.summarizer = ResumeSummarizer(settings=self.settings)
+        metrics_settings = settings_loader.get_metrics_settings(self.settings)
+        if metrics_settings.get('port'):
+            start_metrics_export(metrics_settings['port'], metrics_settings.get('host', '127.0.0.1'))
+        
+        # Reuse the shared summarizer with this session's model choice
+        shared_summarizer = get_shared_summarizer(settings_loader.settings_version())
+        self.summarizer = shared_summarizer.with_model(
+            st.session_state.get('selected_model', shared_summarizer.model)
+        )
+        
+        # Background summarization jobs
+        self.job_manager = get_job_manager()
+        self.poll_interval = settings_loader.get_job_settings(self.settings).get('poll_interval', 0.5)
         
         # Initialize UI components
         self.ui = UI()
-        self.file_handler = FileHandler()
+        upload_settings = settings_loader.get_upload_settings(self.settings)
+        self.file_handler = FileHandler(spool_threshold_mb=upload_settings.get('spool_threshold_mb', 10))
+        cleanup_stale_uploads(upload_settings.get('stale_temp_file_hours', 24))
             
     def run(self):
         """Run the main application loop."""
@@ -63,11 +121,21 @@ class ResumeSummarizerApp:
             if uploaded_file is not None:
                 self._process_uploaded_file(uploaded_file)
             
+            # Show this session's job, also after a rerun or a reconnect
+            job = self.job_manager.get(self._current_job_id())
+            poll_job = job is not None and self._render_job(job)
+            
             # Render instructions
             self.ui.render_instructions()
             
         except Exception as e:
             self.ui.render_error(f"An unexpected error occurred: {str(e)}")
+            return
+        
+        if poll_job:
+            # No fragment support: rerun the whole page once the rest of it is shown
+            time.sleep(self.poll_interval)
+            st.rerun()
     
     def _process_uploaded_file(self, uploaded_file):
         """
@@ -89,51 +157,96 @@ class ResumeSummarizerApp:
     
     def _generate_summary(self, uploaded_file):
         """
-        Generate summary for uploaded file.
+        Start a background summarization job for the uploaded file.
         
         Args:
             uploaded_file: Streamlit uploaded file object
         """
-        progress_tracker = ProgressTracker()
-        temp_file_path = None
+        # Keep small uploads in memory and spool large ones to disk; the job releases it when done
+        save_start = time.perf_counter()
+        document = self.file_handler.open_uploaded_file(uploaded_file)
+        save_seconds = time.perf_counter() - save_start
+        metrics_registry.observe("stage_seconds", save_seconds, stage="save")
         
-        try:
-            with st.spinner("Processing document..."):
-                # Save uploaded file temporarily
-                temp_file_path = self.file_handler.save_uploaded_file(uploaded_file)
-                
-                # Get file extension
-                file_extension = self.file_handler.get_file_extension(uploaded_file.name)
-                
-                # Define progress callback for chunked processing
-                def progress_callback(current, total, text):
-                    progress_tracker.update_progress(current, total, text)
-                
-                # Get the prompt from settings
-                custom_prompt = settings_loader.get_prompt(self.settings)
-                
-                # Process document with progress callback
-                result = self.summarizer.process_document(
-                    file_path=temp_file_path,
-                    file_type=file_extension,
-                    progress_callback=progress_callback,
-                    custom_prompt=custom_prompt
-                )
-                
-                # Handle result
-                if result.success:
-                    self._display_summary_result(result, uploaded_file.name)
-                else:
-                    self.ui.render_error(f"Error generating summary: {result.error}")
-                
-        except Exception as e:
-            self.ui.render_error(f"Error generating summary: {str(e)}")
+        # Get the prompt from settings
+        custom_prompt = settings_loader.get_prompt(self.settings)
+        
+        # Identical uploads with the same model and prompt share one job
+        job_key = SummaryCache.make_key(
+            SummaryCache.hash_file(document),
+            model=self.summarizer.model,
+            prompt=custom_prompt
+        )
+        job = self.job_manager.submit_document(
+            self.summarizer,
+            key=job_key,
+            filename=uploaded_file.name,
+            file_path=document,
+            file_type=self.file_handler.get_file_extension(uploaded_file.name),
+            custom_prompt=custom_prompt,
+            cleanup=self.file_handler.cleanup_temp_file,
+            stage_timings={'save': save_seconds}
+        )
+        
+        # Remember the job in the session and the URL, so a reconnect finds it
+        st.session_state['job_id'] = job.job_id
+        st.query_params['job'] = job.job_id
+    
+    @staticmethod
+    def _current_job_id():
+        return st.session_state.get('job_id') or st.query_params.get('job')
+    
+    def _render_job(self, job: SummaryJob) -> bool:
+        """
+        Show a job's progress and partial summary, or its result once it finished.
+        
+        The script never waits for the job. While it runs, a fragment
+        re-renders just the job every poll_interval and reruns the page when
+        it finishes, so the other widgets stay usable. Streamlit versions
+        without fragments fall back to rerunning the whole page.
+        
+        Args:
+            job: Job to display
             
-        finally:
-            # Clean up
-            progress_tracker.finish()
-            if temp_file_path:
-                self.file_handler.cleanup_temp_file(temp_file_path)
+        Returns:
+            bool: True if the caller has to rerun the page to refresh the job
+        """
+        if job.is_finished:
+            self._render_job_result(job)
+            return False
+        
+        fragment = getattr(st, 'fragment', None)
+        if fragment is None:
+            self._render_job_progress(job)
+            return True
+        fragment(run_every=self.poll_interval)(self._render_job_fragment)(job.job_id)
+        return False
+    
+    def _render_job_fragment(self, job_id: str):
+        job = self.job_manager.get(job_id)
+        if job is None or job.is_finished:
+            # Rerun the page, which shows the result without polling
+            st.rerun()
+        self._render_job_progress(job)
+    
+    def _render_job_progress(self, job: SummaryJob):
+        status_text = job.progress_text or (
+            "Waiting for a free worker..." if job.status == "queued" else "Processing document..."
+        )
+        ProgressTracker().update_progress(job.progress_current, max(job.progress_total, 1), status_text)
+        if job.partial_summary:
+            self.ui.render_summary_result(job.partial_summary)
+    
+    def _render_job_result(self, job: SummaryJob):
+        result = job.result
+        if result.duplicate_of is not None:
+            self.ui.render_duplicate_notice(result.duplicate_of, reused=result.success)
+        if result.success:
+            self._display_summary_result(result, job.filename)
+            if result.skipped_pages:
+                self.ui.render_skipped_pages(result.skipped_pages)
+        elif result.duplicate_of is None:
+            self.ui.render_error(f"Error generating summary: {result.error}")
     
     def _display_summary_result(self, result: SummaryResult, original_filename: str):
         """
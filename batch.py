@@ -0,0 +1,69 @@
+import argparse
+import json
+import sys
+
+from src.components.batch_processor import BatchProcessor
+from src.components.resume_summarizer import ResumeSummarizer
+from src.utils.metrics import metrics_registry
+from src.utils.settings_loader import SettingsLoader
+
+
+def parse_args(argv=None):
+    """Parse command-line arguments for the batch summarizer."""
+    parser = argparse.ArgumentParser(
+        description="Summarize every PDF/DOCX CV in a directory into a JSONL file."
+    )
+    parser.add_argument("input_dir", help="Directory to scan recursively for CVs")
+    parser.add_argument("-o", "--output", default="summaries.jsonl",
+                        help="JSONL file results are appended to (default: summaries.jsonl)")
+    parser.add_argument("--checkpoint",
+                        help="Checkpoint file of finished documents (default: <output>.checkpoint)")
+    parser.add_argument("--settings", default="settings.json", help="Path to settings.json")
+    parser.add_argument("--extract-workers", type=int,
+                        help="Number of text extraction processes")
+    parser.add_argument("--llm-workers", type=int,
+                        help="Number of documents summarized concurrently")
+    parser.add_argument("--metrics-out",
+                        help="Write aggregated timing and token metrics for the run to this JSON file")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    """Entry point for headless batch summarization."""
+    args = parse_args(argv)
+    settings_loader = SettingsLoader(args.settings)
+    settings = settings_loader.load_settings()
+    batch_settings = settings_loader.get_batch_settings(settings)
+
+    summarizer = ResumeSummarizer(settings=settings)
+    if not summarizer.warm_up():
+        print(f"Warning: could not preload model {summarizer.model}", file=sys.stderr)
+    processor = BatchProcessor(
+        summarizer,
+        output_path=args.output,
+        checkpoint_path=args.checkpoint,
+        extract_workers=args.extract_workers or batch_settings.get('extract_workers'),
+        llm_workers=args.llm_workers or batch_settings.get('llm_workers', 2),
+        custom_prompt=settings_loader.get_prompt(settings)
+    )
+
+    try:
+        stats = processor.run(args.input_dir)
+    except KeyboardInterrupt:
+        print("Interrupted; rerun the same command to resume.", file=sys.stderr)
+        return 130
+    finally:
+        if args.metrics_out:
+            with open(args.metrics_out, 'w') as f:
+                json.dump(metrics_registry.to_json(), f, indent=2)
+
+    print(
+        f"Done: {stats['succeeded']} succeeded, {stats['failed']} failed, "
+        f"{stats['skipped']} already finished (of {stats['total']})",
+        file=sys.stderr
+    )
+    return 1 if stats['failed'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,273 @@
+import argparse
+import json
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+
+
+SUMMARY_SENTENCES = [
+    "The candidate is an experienced professional with a consistent record of delivery.",
+    "They combine strong technical depth with clear communication and stakeholder skills.",
+    "Recent roles show growing ownership of systems and people.",
+    "Measurable outcomes are cited for most positions, which supports the claims made.",
+    "Gaps include limited exposure to large-scale leadership and few recent certifications.",
+    "Overall a solid fit for mid to senior roles that value hands-on execution.",
+]
+
+
+class FakeOllamaServer:
+    """Local stand-in for the Ollama HTTP API used by benchmarks.
+
+    Implements /api/tags, /api/ps, /api/show, /api/generate and /api/chat
+    (streaming and non-streaming) with configurable latency and decode speed,
+    so end-to-end timings can be measured without a GPU or a real model.
+
+    Like Ollama, it keeps the last prompt per model as a KV cache: only the
+    part of a prompt after its common prefix with the previous one is
+    prefilled and counted in prompt_eval_count.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, models: Optional[List[str]] = None,
+                 latency: float = 0.05, tokens_per_sec: float = 200.0, context_length: int = 8192,
+                 prefill_tokens_per_sec: float = 2000.0):
+        """
+        Initialize the fake server.
+
+        Args:
+            host: Interface to bind
+            port: Port to bind (0 picks a free port)
+            models: Model names to advertise
+            latency: Seconds before the first token of each response
+            tokens_per_sec: Simulated decode speed
+            context_length: Context length reported by /api/show
+            prefill_tokens_per_sec: Simulated prompt evaluation speed for uncached tokens
+        """
+        self.models = models or ["fake-model:latest"]
+        self.latency = latency
+        self.tokens_per_sec = tokens_per_sec
+        self.context_length = context_length
+        self.prefill_tokens_per_sec = prefill_tokens_per_sec
+        self.request_counts: Dict[str, int] = {}
+        self.prompt_tokens = 0
+        self.prefilled_tokens = 0
+        self._cached_prompts: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeOllamaServer":
+        """Serve requests on a background thread."""
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Shut the server down."""
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> "FakeOllamaServer":
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def clear_prefix_cache(self):
+        """Forget the cached prompts, as if the models had been reloaded."""
+        with self._lock:
+            self._cached_prompts.clear()
+
+    def _count(self, path: str):
+        with self._lock:
+            self.request_counts[path] = self.request_counts.get(path, 0) + 1
+
+    def _model_entry(self, name: str) -> Dict[str, Any]:
+        return {
+            "name": name,
+            "model": name,
+            "modified_at": datetime.now(timezone.utc).isoformat(),
+            "size": 4_000_000_000,
+            "digest": "0" * 64,
+            "details": {"format": "gguf", "family": "fake", "parameter_size": "7B",
+                        "quantization_level": "Q4_0"},
+        }
+
+    def _prefill(self, model: str, prompt: str) -> int:
+        """Simulate prompt evaluation, returning the number of tokens evaluated."""
+        with self._lock:
+            cached = os.path.commonprefix([self._cached_prompts.get(model, ""), prompt])
+            self._cached_prompts[model] = prompt
+            evaluated = max(1, (len(prompt) - len(cached)) // 4)
+            self.prompt_tokens += max(1, len(prompt) // 4)
+            self.prefilled_tokens += evaluated
+        if self.prefill_tokens_per_sec:
+            time.sleep(evaluated / self.prefill_tokens_per_sec)
+        return evaluated
+
+    def _completion_tokens(self, num_predict: int) -> List[str]:
+        words = " ".join(SUMMARY_SENTENCES).split(" ")
+        count = max(1, min(num_predict, len(words)))
+        return [word + " " for word in words[:count]]
+
+    def _timings(self, prompt_eval_count: int, eval_count: int, started: float) -> Dict[str, Any]:
+        total = time.time() - started
+        eval_seconds = eval_count / self.tokens_per_sec
+        prefill_seconds = prompt_eval_count / self.prefill_tokens_per_sec if self.prefill_tokens_per_sec else 0.0
+        return {
+            "total_duration": int(total * 1e9),
+            "load_duration": 0,
+            "prompt_eval_count": prompt_eval_count,
+            "prompt_eval_duration": int((self.latency + prefill_seconds) * 1e9),
+            "eval_count": eval_count,
+            "eval_duration": int(eval_seconds * 1e9),
+        }
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def _send_json(self, payload: Dict[str, Any], status: int = 200):
+                body = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _read_json(self) -> Dict[str, Any]:
+                length = int(self.headers.get("Content-Length") or 0)
+                return json.loads(self.rfile.read(length) or b"{}")
+
+            def do_GET(self):
+                server._count(self.path)
+                if self.path == "/api/tags":
+                    self._send_json({"models": [server._model_entry(m) for m in server.models]})
+                elif self.path == "/api/ps":
+                    self._send_json({"models": [server._model_entry(m) for m in server.models]})
+                elif self.path == "/":
+                    self._send_json({"status": "Ollama is running"})
+                else:
+                    self._send_json({"error": "not found"}, 404)
+
+            def do_HEAD(self):
+                self.send_response(200)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def do_POST(self):
+                server._count(self.path)
+                request = self._read_json()
+                if self.path == "/api/show":
+                    self._send_json({
+                        "modelfile": "",
+                        "parameters": "",
+                        "template": "{{ .Prompt }}",
+                        "details": server._model_entry(request.get("model", ""))["details"],
+                        "model_info": {"fake.context_length": server.context_length},
+                    })
+                elif self.path == "/api/generate":
+                    started = time.time()
+                    time.sleep(server.latency)
+                    self._send_json({
+                        "model": request.get("model"),
+                        "created_at": datetime.now(timezone.utc).isoformat(),
+                        "response": "",
+                        "done": True,
+                        "done_reason": "load",
+                        **server._timings(max(1, len(request.get("prompt", "")) // 4), 0, started),
+                    })
+                elif self.path == "/api/chat":
+                    self._chat(request)
+                else:
+                    self._send_json({"error": "not found"}, 404)
+
+            def _chat(self, request: Dict[str, Any]):
+                started = time.time()
+                # Render the messages the way a chat template would, role markers included
+                prompt = "".join(
+                    f"<|{m.get('role', 'user')}|>{m.get('content', '')}" for m in request.get("messages", [])
+                ) + "<|assistant|>"
+                num_predict = (request.get("options") or {}).get("num_predict", 128)
+                tokens = server._completion_tokens(num_predict)
+                model = request.get("model")
+                time.sleep(server.latency)
+                prompt_eval_count = server._prefill(model, prompt)
+
+                def chunk(content: str, done: bool) -> Dict[str, Any]:
+                    payload = {
+                        "model": model,
+                        "created_at": datetime.now(timezone.utc).isoformat(),
+                        "message": {"role": "assistant", "content": content},
+                        "done": done,
+                    }
+                    if done:
+                        payload["done_reason"] = "stop"
+                        payload.update(server._timings(prompt_eval_count, len(tokens), started))
+                    return payload
+
+                if not request.get("stream", True):
+                    time.sleep(len(tokens) / server.tokens_per_sec)
+                    self._send_json(chunk("".join(tokens), True))
+                    return
+
+                self.send_response(200)
+                self.send_header("Content-Type", "application/x-ndjson")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                try:
+                    for token in tokens:
+                        time.sleep(1 / server.tokens_per_sec)
+                        self._write_chunk(chunk(token, False))
+                    self._write_chunk(chunk("", True))
+                    self.wfile.write(b"0\r\n\r\n")
+                except (BrokenPipeError, ConnectionResetError):
+                    # Client stopped reading (e.g. cancelled a stream)
+                    self.close_connection = True
+
+            def _write_chunk(self, payload: Dict[str, Any]):
+                data = json.dumps(payload).encode() + b"\n"
+                self.wfile.write(b"%x\r\n" % len(data) + data + b"\r\n")
+                self.wfile.flush()
+
+        return Handler
+
+
+def main(argv=None):
+    """Run the fake server in the foreground."""
+    parser = argparse.ArgumentParser(description="Fake Ollama server for benchmarks and local testing")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11435)
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds before the first token")
+    parser.add_argument("--tokens-per-sec", type=float, default=200.0, help="Simulated decode speed")
+    parser.add_argument("--prefill-tokens-per-sec", type=float, default=2000.0,
+                        help="Simulated prompt evaluation speed (0 disables prefill delay)")
+    parser.add_argument("--model", action="append", dest="models", help="Model name to advertise")
+    args = parser.parse_args(argv)
+
+    server = FakeOllamaServer(args.host, args.port, args.models, args.latency, args.tokens_per_sec,
+                              prefill_tokens_per_sec=args.prefill_tokens_per_sec)
+    print(f"Fake Ollama listening on {server.base_url}")
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server._httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from benchmarks.fake_ollama import FakeOllamaServer
+from benchmarks.synthetic_cvs import generate_corpus
+from src.components.resume_summarizer import ResumeSummarizer
+from src.utils.settings_loader import SettingsLoader
+
+
+def percentile(samples: List[float], fraction: float) -> float:
+    """
+    Linearly interpolated percentile of a list of samples.
+
+    Args:
+        samples: Measured values
+        fraction: Percentile as a fraction (0.95 for p95)
+
+    Returns:
+        float: The percentile value
+    """
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    position = (len(ordered) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def measure(name: str, func: Callable[[Any], Any], inputs: List[Any], repeat: int,
+            size_of: Callable[[Any], int] = None) -> Dict[str, Any]:
+    """
+    Time a function over a set of inputs.
+
+    Args:
+        name: Benchmark name
+        func: Function taking one input
+        inputs: Inputs to run through func
+        repeat: Number of passes over the inputs
+        size_of: Optional function giving an input's size in bytes for throughput
+
+    Returns:
+        Dict with latency percentiles (seconds) and throughput
+    """
+    latencies = []
+    total_bytes = 0
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for item in inputs:
+            call_start = time.perf_counter()
+            func(item)
+            latencies.append(time.perf_counter() - call_start)
+            if size_of:
+                total_bytes += size_of(item)
+    elapsed = time.perf_counter() - started
+
+    result = {
+        'name': name,
+        'calls': len(latencies),
+        'total_seconds': elapsed,
+        'ops_per_second': len(latencies) / elapsed if elapsed else 0.0,
+        'p50': percentile(latencies, 0.50),
+        'p95': percentile(latencies, 0.95),
+        'p99': percentile(latencies, 0.99),
+        'mean': sum(latencies) / len(latencies) if latencies else 0.0,
+    }
+    if size_of:
+        result['mb_per_second'] = total_bytes / elapsed / 1e6 if elapsed else 0.0
+    return result
+
+
+def measure_prefill(server: FakeOllamaServer, settings: Dict[str, Any], paths: List[str],
+                    layout: str, cold: bool = False) -> Dict[str, Any]:
+    """
+    Summarize documents back to back and report how much prompt prefill the KV cache saved.
+
+    Args:
+        server: Running fake server (its prefix cache is cleared first)
+        settings: Benchmark settings
+        paths: Documents to summarize, in order
+        layout: Prompt layout to use ("inline" or "prefix")
+        cold: Clear the server's prefix cache before every document, as a no-reuse baseline
+
+    Returns:
+        Dict with prompt tokens sent, tokens actually prefilled and Ollama-reported prefill time
+    """
+    layout_settings = json.loads(json.dumps(settings))
+    layout_settings['model_settings']['prompt_layout'] = layout
+    summarizer = ResumeSummarizer(settings=layout_settings)
+
+    server.clear_prefix_cache()
+    prompt_tokens, prefilled_tokens = server.prompt_tokens, server.prefilled_tokens
+    prompt_eval_seconds = 0.0
+    started = time.perf_counter()
+    for path in paths:
+        if cold:
+            server.clear_prefix_cache()
+        result = summarizer.process_document(path, os.path.splitext(path)[1].lstrip('.'))
+        prompt_eval_seconds += sum((call.get('prompt_eval_duration') or 0) / 1e9 for call in result.llm_calls)
+    elapsed = time.perf_counter() - started
+    prompt_tokens = server.prompt_tokens - prompt_tokens
+    prefilled_tokens = server.prefilled_tokens - prefilled_tokens
+
+    return {
+        'name': f"prefill[{layout}{', cold' if cold else ''}]",
+        'documents': len(paths),
+        'total_seconds': elapsed,
+        'prompt_tokens': prompt_tokens,
+        'prefilled_tokens': prefilled_tokens,
+        'reused_fraction': 1 - prefilled_tokens / prompt_tokens if prompt_tokens else 0.0,
+        'prompt_eval_seconds': prompt_eval_seconds,
+    }
+
+
+def run(page_counts: List[int], copies: int, repeat: int, latency: float,
+        tokens_per_sec: float, settings_file: str) -> Dict[str, Any]:
+    """
+    Run the benchmark suite against a synthetic corpus and a fake Ollama server.
+
+    Returns:
+        Dict with environment details and one entry per benchmark
+    """
+    settings = SettingsLoader(settings_file).load_settings()
+    results = []
+
+    with tempfile.TemporaryDirectory() as corpus_dir, \
+            FakeOllamaServer(latency=latency, tokens_per_sec=tokens_per_sec) as server:
+        paths = generate_corpus(corpus_dir, page_counts, copies)
+        pdfs = [p for p in paths if p.endswith('.pdf')]
+        docxs = [p for p in paths if p.endswith('.docx')]
+
+        bench_settings = json.loads(json.dumps(settings))
+        bench_settings.setdefault('ollama_settings', {})['base_url'] = server.base_url
+        bench_settings['cache_settings'] = {'enabled': False}
+        bench_settings['similarity_settings'] = {'enabled': False}
+        summarizer = ResumeSummarizer(settings=bench_settings)
+
+        raw_texts = [summarizer.extract_text_from_pdf(p) for p in pdfs]
+        clean_texts = [summarizer.preprocess_text(t) for t in raw_texts]
+
+        results.append(measure("extract_text_from_pdf", summarizer.extract_text_from_pdf,
+                               pdfs, repeat, os.path.getsize))
+        results.append(measure("extract_text_from_docx", summarizer.extract_text_from_docx,
+                               docxs, repeat, os.path.getsize))
+        results.append(measure("preprocess_text", summarizer.preprocess_text,
+                               raw_texts, repeat, lambda t: len(t.encode())))
+        results.append(measure("chunk_text", summarizer.chunk_text,
+                               clean_texts, repeat, lambda t: len(t.encode())))
+        for file_type, files in (("pdf", pdfs), ("docx", docxs)):
+            results.append(measure(
+                f"process_document[{file_type}]",
+                lambda path, file_type=file_type: summarizer.process_document(path, file_type),
+                files, repeat, os.path.getsize
+            ))
+
+        # Back-to-back single-call CVs, where the static prompt prefix dominates prefill
+        short_cvs = [p for p in pdfs if f"_{min(page_counts):03d}p_" in os.path.basename(p)]
+        prefill = [
+            measure_prefill(server, bench_settings, short_cvs, "prefix", cold=True),
+            measure_prefill(server, bench_settings, short_cvs, "inline"),
+            measure_prefill(server, bench_settings, short_cvs, "prefix"),
+        ]
+
+        ollama_requests = dict(server.request_counts)
+
+    return {
+        'environment': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+        },
+        'parameters': {
+            'page_counts': page_counts,
+            'copies': copies,
+            'repeat': repeat,
+            'fake_latency': latency,
+            'fake_tokens_per_sec': tokens_per_sec,
+        },
+        'ollama_requests': ollama_requests,
+        'benchmarks': results,
+        'prefill': prefill,
+    }
+
+
+def main(argv=None) -> int:
+    """Command-line entry point; writes JSON results to stdout or a file."""
+    parser = argparse.ArgumentParser(description="Benchmark extraction, preprocessing, chunking and summarization")
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 3, 10, 40],
+                        help="CV lengths in pages to generate")
+    parser.add_argument("--copies", type=int, default=3, help="Distinct CVs per length and format")
+    parser.add_argument("--repeat", type=int, default=3, help="Passes over the corpus per benchmark")
+    parser.add_argument("--latency", type=float, default=0.05, help="Fake Ollama time to first token")
+    parser.add_argument("--tokens-per-sec", type=float, default=200.0, help="Fake Ollama decode speed")
+    parser.add_argument("--settings", default="settings.json", help="Settings file to benchmark")
+    parser.add_argument("-o", "--output", help="Write JSON results to this file instead of stdout")
+    args = parser.parse_args(argv)
+
+    report = run(args.pages, args.copies, args.repeat, args.latency, args.tokens_per_sec, args.settings)
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
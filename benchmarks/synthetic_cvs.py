@@ -0,0 +1,205 @@
+import os
+import random
+import zipfile
+from typing import List
+from xml.sax.saxutils import escape
+
+
+FIRST_NAMES = ["Alex", "Jordan", "Sam", "Taylor", "Morgan", "Casey", "Riley", "Jamie", "Avery", "Quinn"]
+LAST_NAMES = ["Smith", "Garcia", "Chen", "Okafor", "Novak", "Silva", "Khan", "Larsen", "Rossi", "Tanaka"]
+ROLES = ["Software Engineer", "Data Analyst", "Product Manager", "DevOps Engineer", "UX Designer",
+         "Research Scientist", "Sales Lead", "Financial Analyst", "QA Engineer", "Team Lead"]
+COMPANIES = ["Acme Corp", "Globex", "Initech", "Umbrella Labs", "Hooli", "Stark Industries",
+             "Wayne Enterprises", "Wonka Industries", "Cyberdyne", "Tyrell Systems"]
+SKILLS = ["Python", "SQL", "Kubernetes", "React", "Terraform", "Machine Learning", "Spark", "Go",
+          "Stakeholder Management", "Agile", "AWS", "Data Visualization", "Java", "CI/CD", "Figma"]
+VERBS = ["Led", "Built", "Designed", "Delivered", "Optimized", "Migrated", "Automated", "Mentored",
+         "Launched", "Scaled"]
+OBJECTS = ["a customer analytics platform", "the payments backend", "an internal developer portal",
+           "a real-time reporting pipeline", "the onboarding flow", "a cross-functional team of 8",
+           "the cloud cost program", "a recommendation service", "the release process",
+           "a data quality framework"]
+OUTCOMES = ["reducing latency by 40%", "saving $200k per year", "increasing conversion by 12%",
+            "cutting deployment time from hours to minutes", "serving 2M monthly users",
+            "improving test coverage to 85%", "with zero downtime", "ahead of schedule"]
+
+
+def generate_cv_paragraphs(pages: int, seed: int = 0) -> List[str]:
+    """
+    Generate the paragraphs of a synthetic CV.
+
+    Args:
+        pages: Approximate number of PDF pages the CV should fill
+        seed: Random seed, so corpora are reproducible
+
+    Returns:
+        List[str]: CV paragraphs (headings, sentences and bullet lines)
+    """
+    rng = random.Random(seed)
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    paragraphs = [
+        name,
+        f"{rng.choice(ROLES)} | {name.lower().replace(' ', '.')}@example.com | +1 555 {rng.randint(100, 999)} {rng.randint(1000, 9999)}",
+        "Summary",
+        f"{rng.choice(ROLES)} with {rng.randint(2, 20)} years of experience in "
+        f"{', '.join(rng.sample(SKILLS, 3))}.",
+        "Skills",
+        ", ".join(rng.sample(SKILLS, 8)),
+        "Experience",
+    ]
+
+    # Roughly 45 lines of text fit on a generated PDF page
+    target_lines = pages * 45
+    while sum(len(p) // 90 + 1 for p in paragraphs) < target_lines:
+        start = rng.randint(2000, 2022)
+        paragraphs.append(f"{rng.choice(ROLES)}, {rng.choice(COMPANIES)} ({start} - {start + rng.randint(1, 4)})")
+        for _ in range(rng.randint(3, 6)):
+            paragraphs.append(
+                f"- {rng.choice(VERBS)} {rng.choice(OBJECTS)}, {rng.choice(OUTCOMES)}."
+            )
+
+    paragraphs.extend(["Education", f"BSc Computer Science, University of {rng.choice(LAST_NAMES)}"])
+    return paragraphs
+
+
+def _wrap(text: str, width: int = 90) -> List[str]:
+    lines, current = [], ""
+    for word in text.split():
+        if current and len(current) + 1 + len(word) > width:
+            lines.append(current)
+            current = word
+        else:
+            current = f"{current} {word}" if current else word
+    lines.append(current)
+    return lines
+
+
+def write_pdf(paragraphs: List[str], path: str, lines_per_page: int = 45):
+    """
+    Write paragraphs to a simple text-only PDF.
+
+    Args:
+        paragraphs: Paragraphs to lay out
+        path: Output file path
+        lines_per_page: Number of text lines per page
+    """
+    lines = [line for paragraph in paragraphs for line in _wrap(paragraph)]
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [[]]
+
+    objects = []
+    page_ids = []
+    font_id = 3
+    next_id = 4
+    for page_lines in pages:
+        escaped = [
+            line.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)') for line in page_lines
+        ]
+        content = "BT /F1 10 Tf 50 790 Td 16 TL " + " ".join(f"({line}) '" for line in escaped) + " ET"
+        content_bytes = content.encode('latin-1', 'replace')
+        page_id, content_id = next_id, next_id + 1
+        next_id += 2
+        page_ids.append(page_id)
+        objects.append((page_id, (
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] "
+            f"/Resources << /Font << /F1 {font_id} 0 R >> >> /Contents {content_id} 0 R >>"
+        ).encode()))
+        objects.append((content_id, b"<< /Length %d >>\nstream\n" % len(content_bytes)
+                        + content_bytes + b"\nendstream"))
+
+    kids = " ".join(f"{page_id} 0 R" for page_id in page_ids)
+    objects = [
+        (1, b"<< /Type /Catalog /Pages 2 0 R >>"),
+        (2, f"<< /Type /Pages /Kids [{kids}] /Count {len(page_ids)} >>".encode()),
+        (font_id, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"),
+    ] + objects
+
+    body = bytearray(b"%PDF-1.4\n")
+    offsets = {}
+    for object_id, data in objects:
+        offsets[object_id] = len(body)
+        body += b"%d 0 obj\n" % object_id + data + b"\nendobj\n"
+
+    xref_offset = len(body)
+    body += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for object_id in range(1, len(objects) + 1):
+        body += b"%010d 00000 n \n" % offsets[object_id]
+    body += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref_offset)
+
+    with open(path, 'wb') as f:
+        f.write(bytes(body))
+
+
+_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/word/document.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+    '</Types>'
+)
+_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="word/document.xml"/>'
+    '</Relationships>'
+)
+
+
+def write_docx(paragraphs: List[str], path: str):
+    """
+    Write paragraphs to a minimal DOCX file.
+
+    The skills line is written as a one-row table, as many CV templates do.
+
+    Args:
+        paragraphs: Paragraphs to write
+        path: Output file path
+    """
+    body = []
+    for paragraph in paragraphs:
+        run = f'<w:p><w:r><w:t xml:space="preserve">{escape(paragraph)}</w:t></w:r></w:p>'
+        if paragraph.count(", ") >= 5:
+            cells = "".join(
+                f'<w:tc><w:p><w:r><w:t>{escape(skill)}</w:t></w:r></w:p></w:tc>'
+                for skill in paragraph.split(", ")
+            )
+            body.append(f'<w:tbl><w:tr>{cells}</w:tr></w:tbl>')
+        else:
+            body.append(run)
+
+    document = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+        f'<w:body>{"".join(body)}</w:body></w:document>'
+    )
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as docx:
+        docx.writestr('[Content_Types].xml', _CONTENT_TYPES)
+        docx.writestr('_rels/.rels', _RELS)
+        docx.writestr('word/document.xml', document)
+
+
+def generate_corpus(directory: str, page_counts: List[int], copies: int = 1) -> List[str]:
+    """
+    Write a corpus of synthetic PDF and DOCX CVs.
+
+    Args:
+        directory: Output directory
+        page_counts: Lengths (in pages) to generate
+        copies: Number of distinct CVs per length and format
+
+    Returns:
+        List[str]: Paths of the generated files
+    """
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for pages in page_counts:
+        for copy_index in range(copies):
+            paragraphs = generate_cv_paragraphs(pages, seed=pages * 1000 + copy_index)
+            for extension, writer in (("pdf", write_pdf), ("docx", write_docx)):
+                path = os.path.join(directory, f"cv_{pages:03d}p_{copy_index}.{extension}")
+                writer(paragraphs, path)
+                paths.append(path)
+    return paths
@@ -0,0 +1,63 @@
+import argparse
+import asyncio
+import sys
+
+from src.components.resume_summarizer import ResumeSummarizer
+from src.components.summary_service import SummaryHTTPServer, SummaryService
+from src.utils.settings_loader import SettingsLoader
+
+
+def parse_args(argv=None):
+    """Parse command-line arguments for the HTTP service."""
+    parser = argparse.ArgumentParser(
+        description="Serve CV summarization over HTTP (POST /summarize, GET /healthz, GET /metrics)."
+    )
+    parser.add_argument("--settings", default="settings.json", help="Path to settings.json")
+    parser.add_argument("--host", help="Interface to bind (default from service_settings)")
+    parser.add_argument("--port", type=int, help="Port to listen on (default from service_settings)")
+    parser.add_argument("--batch-size", type=int, help="Maximum documents summarized concurrently")
+    parser.add_argument("--queue-size", type=int, help="Waiting requests before new ones get 429")
+    return parser.parse_args(argv)
+
+
+async def serve(server: SummaryHTTPServer):
+    """Run the server until cancelled."""
+    await server.start()
+    print(f"Listening on http://{server.host}:{server.port}", file=sys.stderr)
+    await server.serve_forever()
+
+
+def main(argv=None) -> int:
+    """Entry point for the summarization HTTP service."""
+    args = parse_args(argv)
+    settings_loader = SettingsLoader(args.settings)
+    settings = settings_loader.load_settings()
+    service_settings = settings_loader.get_service_settings(settings)
+
+    summarizer = ResumeSummarizer(settings=settings)
+    if not summarizer.warm_up():
+        print(f"Warning: could not preload model {summarizer.model}", file=sys.stderr)
+    service = SummaryService(
+        summarizer,
+        batch_size=args.batch_size or service_settings.get('batch_size', 4),
+        batch_wait_ms=service_settings.get('batch_wait_ms', 20),
+        queue_size=args.queue_size or service_settings.get('queue_size', 32),
+        max_batches=service_settings.get('max_batches', 2),
+        custom_prompt=settings_loader.get_prompt(settings)
+    )
+    server = SummaryHTTPServer(
+        service,
+        host=args.host or service_settings.get('host', '127.0.0.1'),
+        port=args.port or service_settings.get('port', 8080),
+        max_body_mb=service_settings.get('max_body_mb', 10)
+    )
+
+    try:
+        asyncio.run(serve(server))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
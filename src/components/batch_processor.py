@@ -0,0 +1,266 @@
+import json
+import mmap
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from dataclasses import asdict
+from typing import Any, Dict, Iterator, List, Optional, Set
+
+from .document_extractor import DocumentExtractor, DocumentSource
+from src.utils.metrics import metrics_registry
+from src.utils.summary_cache import SummaryCache
+
+
+class _MappedFile(mmap.mmap):
+    """Read-only file mapping usable as a binary file object.
+
+    mmap objects lack seekable() before Python 3.13; zipfile needs it.
+    """
+
+    def seekable(self) -> bool:
+        return True
+
+
+@contextmanager
+def _open_document(file_path: str, use_mmap: bool) -> Iterator[DocumentSource]:
+    """
+    Open a document for hashing and extraction, memory-mapped when enabled.
+
+    Parsers seek around the file a lot; with a mapping those reads are
+    memory copies served from the page cache instead of read() system calls.
+
+    Args:
+        file_path: Path to the document
+        use_mmap: Map the file instead of passing its path
+
+    Yields:
+        The read-only mapping, or the path itself (also for empty files, which cannot be mapped)
+    """
+    if not use_mmap:
+        yield file_path
+        return
+    with open(file_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield file_path
+            return
+        with _MappedFile(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            yield mapped
+
+
+def _extract_document(file_path: str, settings: Dict[str, Any], page_workers: int) -> Dict[str, Any]:
+    """
+    Process pool entry point: hash and extract a single document.
+
+    Args:
+        file_path: Path to the document
+        settings: Application settings dictionary
+        page_workers: Processes a long PDF's pages are split across
+
+    Returns:
+        Dict with file, content_hash, text (a list of page texts for PDFs) and
+        extract_seconds, or error on failure
+    """
+    file_type = os.path.splitext(file_path)[1].lstrip('.').lower()
+    extractor = DocumentExtractor(settings, max_workers=page_workers)
+    use_mmap = settings.get('batch_settings', {}).get('use_mmap', False)
+    start_time = time.perf_counter()
+    try:
+        with _open_document(file_path, use_mmap) as document:
+            pieces = list(extractor.iter_text(document, file_type))
+            extracted = {
+                'file': file_path,
+                'content_hash': SummaryCache.hash_file(document),
+                # PDF pages stay separate so the reduction stage can find running headers
+                'text': pieces if file_type == 'pdf' else "\n".join(pieces),
+                'extract_seconds': time.perf_counter() - start_time
+            }
+        if extractor.last_stats is not None:
+            extracted['pages'] = extractor.last_stats.pages
+            extracted['pages_per_second'] = extractor.last_stats.pages_per_second
+            extracted['skipped_pages'] = extractor.last_stats.skipped_pages
+        return extracted
+    except Exception as e:
+        return {'file': file_path, 'error': str(e)}
+
+
+class BatchProcessor:
+    """Summarizes whole directories of CVs without the Streamlit UI.
+
+    Text extraction runs in a process pool while summarization runs in a
+    separate, smaller thread pool, so CPU-bound parsing overlaps with model
+    calls. Results are appended to a JSONL file and finished files are
+    recorded in a checkpoint so an interrupted run can be resumed.
+    """
+
+    def __init__(self, summarizer, output_path: str, checkpoint_path: Optional[str] = None,
+                 extract_workers: Optional[int] = None, llm_workers: int = 2,
+                 custom_prompt: Optional[str] = None):
+        """
+        Initialize the batch processor.
+
+        Args:
+            summarizer: ResumeSummarizer instance
+            output_path: JSONL file results are appended to
+            checkpoint_path: File recording finished documents (defaults to output_path + ".checkpoint")
+            extract_workers: Number of extraction processes (defaults to the CPU count)
+            llm_workers: Number of documents summarized concurrently
+            custom_prompt: Optional prompt overriding the one in settings
+        """
+        self.summarizer = summarizer
+        self.output_path = output_path
+        self.checkpoint_path = checkpoint_path or f"{output_path}.checkpoint"
+        self.extract_workers = extract_workers or os.cpu_count() or 1
+        # Each extraction process splits long PDFs across its own page pool; by
+        # default the pools together use about as many processes as there are cores
+        self.page_workers = (summarizer.settings.get('extraction_settings', {}).get('max_workers')
+                             or max(2, (os.cpu_count() or 1) // self.extract_workers))
+        self.llm_workers = max(1, llm_workers)
+        self.custom_prompt = custom_prompt
+
+    @staticmethod
+    def discover_files(directory: str) -> List[str]:
+        """
+        Recursively find supported documents in a directory.
+
+        Args:
+            directory: Directory to walk
+
+        Returns:
+            List[str]: Sorted document paths
+        """
+        found = []
+        for root, _, files in os.walk(directory):
+            for name in files:
+                extension = os.path.splitext(name)[1].lstrip('.').lower()
+                if extension in DocumentExtractor.SUPPORTED_FILE_TYPES:
+                    found.append(os.path.abspath(os.path.join(root, name)))
+        return sorted(found)
+
+    def load_checkpoint(self) -> Set[str]:
+        """
+        Read the set of documents finished by previous runs.
+
+        Returns:
+            Set[str]: Paths of finished documents
+        """
+        if not os.path.exists(self.checkpoint_path):
+            return set()
+        with open(self.checkpoint_path, 'r') as f:
+            return {line.rstrip('\n') for line in f if line.strip()}
+
+    def run(self, directory: str) -> Dict[str, int]:
+        """
+        Summarize every document in a directory that is not yet checkpointed.
+
+        Args:
+            directory: Directory containing PDF/DOCX files
+
+        Returns:
+            Dict[str, int]: Counts of total, skipped, succeeded and failed documents
+        """
+        files = self.discover_files(directory)
+        finished = self.load_checkpoint()
+        pending = [path for path in files if path not in finished]
+        stats = {'total': len(files), 'skipped': len(files) - len(pending), 'succeeded': 0, 'failed': 0}
+
+        with open(self.output_path, 'a') as output, open(self.checkpoint_path, 'a') as checkpoint:
+            for record in self._iter_results(pending):
+                output.write(json.dumps(record) + "\n")
+                output.flush()
+
+                # Failed documents are not checkpointed so a resumed run retries them
+                if record['success']:
+                    checkpoint.write(record['file'] + "\n")
+                    checkpoint.flush()
+                    os.fsync(checkpoint.fileno())
+                    stats['succeeded'] += 1
+                else:
+                    stats['failed'] += 1
+
+                done = stats['succeeded'] + stats['failed']
+                status = "ok" if record['success'] else f"error: {record['error']}"
+                print(f"[{done}/{len(pending)}] {record['file']}: {status}", file=sys.stderr)
+
+        return stats
+
+    def _iter_results(self, paths: List[str]) -> Iterator[Dict[str, Any]]:
+        """Run the two-stage pipeline, yielding one record per finished document."""
+        path_iter = iter(paths)
+        max_in_flight = self.extract_workers + 2 * self.llm_workers
+        extract_pool = ProcessPoolExecutor(max_workers=self.extract_workers)
+        llm_pool = ThreadPoolExecutor(max_workers=self.llm_workers)
+        extracting = {}
+        summarizing = {}
+
+        try:
+            while True:
+                # Bound the work in flight so summarization backpressures extraction
+                while len(extracting) + len(summarizing) < max_in_flight:
+                    path = next(path_iter, None)
+                    if path is None:
+                        break
+                    future = extract_pool.submit(_extract_document, path, self.summarizer.settings,
+                                                 self.page_workers)
+                    extracting[future] = path
+
+                if not extracting and not summarizing:
+                    break
+
+                done, _ = wait(list(extracting) + list(summarizing), return_when=FIRST_COMPLETED)
+                for future in done:
+                    if future in extracting:
+                        path = extracting.pop(future)
+                        extracted = future.result()
+                        if 'error' in extracted:
+                            yield self._error_record(path, extracted['error'])
+                            continue
+                        summary_future = llm_pool.submit(self._summarize, extracted)
+                        summarizing[summary_future] = path
+                    else:
+                        summarizing.pop(future)
+                        yield future.result()
+        finally:
+            for future in list(extracting) + list(summarizing):
+                future.cancel()
+            extract_pool.shutdown(wait=False)
+            llm_pool.shutdown(wait=False)
+
+    def _summarize(self, extracted: Dict[str, Any]) -> Dict[str, Any]:
+        start_time = time.time()
+        try:
+            result = self.summarizer.summarize_text(
+                extracted['text'],
+                custom_prompt=self.custom_prompt,
+                content_hash=extracted['content_hash'],
+                source=extracted['file']
+            )
+        except Exception as e:
+            return self._error_record(extracted['file'], str(e))
+
+        # Extraction ran in a worker process, outside the summarizer's trace
+        record = asdict(result)
+        record['stage_timings']['extract'] = extracted['extract_seconds']
+        record['skipped_pages'] = extracted.get('skipped_pages', [])
+        metrics_registry.observe("stage_seconds", extracted['extract_seconds'], stage="extract")
+        record.update(
+            file=extracted['file'],
+            content_hash=extracted['content_hash'],
+            pages=extracted.get('pages'),
+            pages_per_second=extracted.get('pages_per_second'),
+            elapsed=time.time() - start_time
+        )
+        return record
+
+    @staticmethod
+    def _error_record(path: str, error: str) -> Dict[str, Any]:
+        return {
+            'file': path,
+            'summary': "",
+            'model_used': "",
+            'processing_time': 0.0,
+            'success': False,
+            'error': error,
+            'cached': False
+        }
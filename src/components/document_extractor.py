@@ -0,0 +1,346 @@
+import io
+import multiprocessing.util
+import os
+import re
+import threading
+import time
+import zipfile
+import pdfplumber
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from docx import Document
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Union
+from xml.etree.ElementTree import iterparse
+
+
+@dataclass
+class ExtractionStats:
+    """Timing information for a single document extraction."""
+    pages: int = 0
+    # Pages parsed (fewer than pages when a limit stopped the extraction)
+    pages_read: int = 0
+    # Time spent extracting, excluding time the caller spent between pages
+    seconds: float = 0.0
+    workers: int = 1
+    # False when the pieces are paragraphs (DOCX) rather than pages
+    paged: bool = True
+    # 1-based numbers of pages left unread by the page limit or text budget
+    skipped_pages: List[int] = field(default_factory=list)
+
+    @property
+    def pages_per_second(self) -> float:
+        return self.pages_read / self.seconds if self.seconds > 0 else 0.0
+
+
+# A document is read from a path or, without touching the disk, from a
+# seekable binary file object (io.BytesIO, an mmap, an open file)
+DocumentSource = Union[str, BinaryIO]
+
+_W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+_MC_FALLBACK = '{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback'
+_HEADER_PART = re.compile(r'^word/header\d*\.xml$')
+_FOOTER_PART = re.compile(r'^word/footer\d*\.xml$')
+
+
+# Page extraction pools are shared process-wide, keyed by worker count, so
+# short-lived extractor instances (e.g. one per Streamlit rerun) don't leak processes
+_page_pools: Dict[int, ProcessPoolExecutor] = {}
+_page_pools_lock = threading.Lock()
+
+
+def _get_page_pool(max_workers: int) -> ProcessPoolExecutor:
+    with _page_pools_lock:
+        if max_workers not in _page_pools:
+            pool = ProcessPoolExecutor(max_workers=max_workers)
+            # Inside a batch extraction process, multiprocessing joins the pool's workers at
+            # exit without running atexit hooks, so shut the pool down first (and before the
+            # priority 10 finalizers that stop its queues' feeder threads)
+            multiprocessing.util.Finalize(pool, pool.shutdown, exitpriority=100)
+            _page_pools[max_workers] = pool
+        return _page_pools[max_workers]
+
+
+def _extract_pdf_pages(source: Union[str, bytes], start: int, end: int) -> List[str]:
+    """
+    Process pool entry point: extract text from a range of PDF pages.
+
+    Args:
+        source: Path to the PDF, or its content for documents held in memory
+        start: Index of the first page
+        end: Index one past the last page
+
+    Returns:
+        List[str]: Text of each page in the range
+    """
+    page_texts = []
+    with pdfplumber.open(source if isinstance(source, str) else io.BytesIO(source)) as pdf:
+        for page in pdf.pages[start:end]:
+            page_texts.append(page.extract_text() or "")
+            _release_page(page)
+    return page_texts
+
+
+def _rewind(file_path: DocumentSource) -> DocumentSource:
+    """Seek a file object back to the start (e.g. after it was hashed); paths pass through."""
+    if not isinstance(file_path, str):
+        file_path.seek(0)
+    return file_path
+
+
+def _release_page(page):
+    """Drop pdfplumber's per-page object caches once a page has been read."""
+    if hasattr(page, 'close'):
+        page.close()
+    else:
+        page.flush_cache()
+
+
+class DocumentExtractor:
+    """Extracts raw text from PDF and DOCX documents.
+
+    Holds no model or network state, so it can be constructed cheaply inside
+    worker processes.
+    """
+
+    SUPPORTED_FILE_TYPES = ('pdf', 'docx')
+
+    def __init__(self, settings: Optional[Dict[str, Any]] = None, max_workers: Optional[int] = None):
+        """
+        Initialize the extractor.
+
+        Args:
+            settings: Optional application settings dictionary
+            max_workers: Page extraction processes, overriding the settings (1 disables the pool)
+        """
+        self.settings = settings or {}
+        extraction_settings = self.settings.get('extraction_settings', {})
+        self.parallel_page_threshold = extraction_settings.get('parallel_page_threshold', 20)
+        self.max_workers = max_workers or extraction_settings.get('max_workers') or os.cpu_count() or 1
+        self.max_pages = extraction_settings.get('max_pages')
+        self.max_chars = extraction_settings.get('max_chars')
+        self.docx_engine = extraction_settings.get('docx_engine', 'stream')
+        self.last_stats: Optional[ExtractionStats] = None
+
+    def extract_text(self, file_path: DocumentSource, file_type: str) -> str:
+        """
+        Extract text from a document of the given type.
+
+        Args:
+            file_path: Path to the document, or a seekable binary file object
+            file_type: File extension without the dot ("pdf" or "docx")
+
+        Returns:
+            str: Extracted text
+        """
+        return "".join(piece + "\n" for piece in self.iter_text(file_path, file_type))
+
+    def iter_text(self, file_path: DocumentSource, file_type: str,
+                  stats: Optional[ExtractionStats] = None) -> Iterator[str]:
+        """
+        Stream the text of a document piece by piece (pages or paragraphs).
+
+        Args:
+            file_path: Path to the document, or a seekable binary file object
+            file_type: File extension without the dot ("pdf" or "docx")
+            stats: Optional ExtractionStats filled in once a PDF has been read
+
+        Returns:
+            Iterator[str]: Non-empty text pieces in document order
+        """
+        if file_type == "pdf":
+            return self.iter_pdf_pages(file_path, stats)
+        if file_type == "docx":
+            return self.iter_docx_paragraphs(file_path)
+        raise ValueError("Unsupported file type")
+
+    def extract_text_from_pdf(self, file_path: DocumentSource) -> str:
+        return "".join(page_text + "\n" for page_text in self.iter_pdf_pages(file_path))
+
+    def iter_pdf_pages(self, file_path: DocumentSource,
+                       stats: Optional[ExtractionStats] = None) -> Iterator[str]:
+        """Stream page texts, stopping at max_pages or once max_chars of text have been read.
+
+        Pages past the limits are never parsed; their numbers are recorded in
+        the stats. The page that reaches max_chars is cut at a word boundary.
+        Pool workers reopen the PDF by path or, for file objects, from a copy
+        of its bytes.
+        """
+        stats = stats if stats is not None else ExtractionStats()
+        # Only time spent here counts, not the caller's work between pages
+        extract_seconds = 0.0
+        resumed = time.perf_counter()
+        page_count = 0
+        pages_read = 0
+        chars = 0
+        try:
+            with pdfplumber.open(_rewind(file_path)) as pdf:
+                page_count = len(pdf.pages)
+                pages_to_read = min(page_count, self.max_pages or page_count)
+                parallel = self.max_workers > 1 and pages_to_read >= self.parallel_page_threshold
+                if parallel:
+                    stats.workers = min(self.max_workers, pages_to_read)
+                    source = file_path if isinstance(file_path, str) else _rewind(file_path).read()
+                    page_texts = self._iter_pdf_parallel(source, pages_to_read, stats.workers)
+                else:
+                    page_texts = self._iter_pdf_serial(pdf.pages[:pages_to_read])
+
+                try:
+                    for page_text in page_texts:
+                        extract_seconds += time.perf_counter() - resumed
+                        pages_read += 1
+                        if self.max_chars and page_text and chars + len(page_text) >= self.max_chars:
+                            page_text = self._cut_to_budget(page_text, self.max_chars - chars)
+                            if page_text:
+                                yield page_text
+                            break
+                        if page_text:
+                            chars += len(page_text)
+                            yield page_text
+                        resumed = time.perf_counter()
+                finally:
+                    # Stops the serial reader, or cancels page ranges not yet started
+                    page_texts.close()
+        except Exception as e:
+            raise RuntimeError(f"Error processing PDF: {str(e)}")
+
+        stats.pages = page_count
+        stats.pages_read = pages_read
+        stats.seconds = extract_seconds
+        stats.skipped_pages = list(range(pages_read + 1, page_count + 1))
+        self.last_stats = stats
+
+    @staticmethod
+    def _iter_pdf_serial(pages) -> Iterator[str]:
+        for page in pages:
+            page_text = page.extract_text()
+            _release_page(page)
+            yield page_text
+
+    @staticmethod
+    def _cut_to_budget(text: str, budget: int) -> str:
+        cut = text[:max(budget, 0)]
+        if len(cut) < len(text) and not text[len(cut)].isspace() and ' ' in cut:
+            cut = cut.rsplit(' ', 1)[0]
+        return cut
+
+    def _iter_pdf_parallel(self, source: Union[str, bytes], page_count: int, workers: int) -> Iterator[str]:
+        """Split the pages into contiguous ranges across the pool and yield them in order.
+
+        Using twice as many ranges as workers lets the first pages reach the
+        caller before the whole document has been parsed.
+        """
+        tasks = min(page_count, workers * 2)
+        bounds = [page_count * i // tasks for i in range(tasks + 1)]
+        pool = _get_page_pool(self.max_workers)
+        futures = [
+            pool.submit(_extract_pdf_pages, source, start, end)
+            for start, end in zip(bounds, bounds[1:])
+        ]
+        try:
+            for future in futures:
+                yield from future.result()
+        finally:
+            for future in futures:
+                future.cancel()
+
+    def extract_text_from_docx(self, file_path: DocumentSource) -> str:
+        return "".join(paragraph + "\n" for paragraph in self.iter_docx_paragraphs(file_path))
+
+    def iter_docx_paragraphs(self, file_path: DocumentSource) -> Iterator[str]:
+        try:
+            if self.docx_engine == 'python-docx':
+                doc = Document(_rewind(file_path))
+                for paragraph in doc.paragraphs:
+                    if paragraph.text:
+                        yield paragraph.text
+            else:
+                yield from self._iter_docx_xml(file_path)
+        except Exception as e:
+            raise RuntimeError(f"Error processing DOCX: {str(e)}")
+
+    def _iter_docx_xml(self, file_path: DocumentSource) -> Iterator[str]:
+        """Stream paragraph text straight from the DOCX zip without building a document model.
+
+        Headers come first (CV templates often put the name and contact
+        details there), then the body, then footers. Unlike doc.paragraphs
+        this includes tables, with one line per row and cells separated by
+        " | ", and text boxes.
+        """
+        with zipfile.ZipFile(_rewind(file_path)) as archive:
+            names = archive.namelist()
+            headers = sorted(name for name in names if _HEADER_PART.match(name))
+            footers = sorted(name for name in names if _FOOTER_PART.match(name))
+
+            # Header and footer parts (first page, even pages, ...) often repeat each other
+            seen = set()
+            for part in headers:
+                for text in self._iter_docx_part(archive, part):
+                    if text not in seen:
+                        seen.add(text)
+                        yield text
+
+            yield from self._iter_docx_part(archive, 'word/document.xml')
+
+            seen = set()
+            for part in footers:
+                for text in self._iter_docx_part(archive, part):
+                    if text not in seen:
+                        seen.add(text)
+                        yield text
+
+    @staticmethod
+    def _iter_docx_part(archive: zipfile.ZipFile, part: str) -> Iterator[str]:
+        paragraphs: List[List[str]] = []  # stack: text boxes nest paragraphs in paragraphs
+        rows: List[List[str]] = []  # stack of open table rows (tables nest too)
+        cells: List[List[str]] = []  # paragraphs of each open table cell
+        fallback_depth = 0
+
+        with archive.open(part) as xml:
+            for event, element in iterparse(xml, events=('start', 'end')):
+                tag = element.tag
+                if event == 'start':
+                    if tag == _MC_FALLBACK:
+                        # Legacy copy of the preceding mc:Choice content (e.g. VML text boxes)
+                        fallback_depth += 1
+                    elif fallback_depth:
+                        pass
+                    elif tag == _W + 'p':
+                        paragraphs.append([])
+                    elif tag == _W + 'tr':
+                        rows.append([])
+                    elif tag == _W + 'tc':
+                        cells.append([])
+                    continue
+
+                if tag == _MC_FALLBACK:
+                    fallback_depth -= 1
+                elif fallback_depth:
+                    pass
+                elif tag == _W + 't' and paragraphs:
+                    paragraphs[-1].append(element.text or "")
+                elif tag == _W + 'tab' and paragraphs:
+                    paragraphs[-1].append("\t")
+                elif tag in (_W + 'br', _W + 'cr') and paragraphs:
+                    paragraphs[-1].append("\n")
+                elif tag == _W + 'p' and paragraphs:
+                    text = "".join(paragraphs.pop())
+                    if text and cells and len(paragraphs) == 0:
+                        cells[-1].append(text)
+                    elif text:
+                        yield text
+                elif tag == _W + 'tc' and cells:
+                    cell_text = " ".join(cells.pop())
+                    if cell_text and rows:
+                        rows[-1].append(cell_text)
+                elif tag == _W + 'tr' and rows:
+                    row = rows.pop()
+                    if row:
+                        row_text = " | ".join(row)
+                        if cells:
+                            # A table nested in a cell becomes part of that cell
+                            cells[-1].append(row_text)
+                        else:
+                            yield row_text
+
+                # Keep memory flat: nothing below is needed once an element has ended
+                element.clear()
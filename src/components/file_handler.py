@@ -1,11 +1,45 @@
+import io
 import os
 import tempfile
+import time
+from typing import BinaryIO, Union
 import streamlit as st
 
 
 class FileHandler:
     """Handles file operations for uploaded documents."""
     
+    # Temporary upload files carry this prefix so leftovers can be found and removed
+    TEMP_FILE_PREFIX = "cv-summarizer-"
+    
+    def __init__(self, spool_threshold_mb: float = 10):
+        """
+        Initialize the file handler.
+        
+        Args:
+            spool_threshold_mb: Uploads larger than this are written to disk; smaller
+                ones are processed from memory
+        """
+        self.spool_threshold = int(spool_threshold_mb * 1024 * 1024)
+    
+    def open_uploaded_file(self, uploaded_file) -> Union[str, BinaryIO]:
+        """
+        Get an uploaded file in a form the summarizer can read.
+        
+        Streamlit already holds uploads in memory, so small files are wrapped
+        in a buffer instead of being copied to disk and read back. Files above
+        the spool threshold are saved to a temporary file.
+        
+        Args:
+            uploaded_file: Streamlit uploaded file object
+            
+        Returns:
+            Union[str, BinaryIO]: In-memory buffer, or path to a temporary file
+        """
+        if uploaded_file.size <= self.spool_threshold:
+            return io.BytesIO(uploaded_file.getvalue())
+        return self.save_uploaded_file(uploaded_file)
+    
     def save_uploaded_file(self, uploaded_file) -> str:
         """
         Save uploaded file to temporary location.
@@ -19,9 +53,10 @@ class FileHandler:
         file_extension = self.get_file_extension(uploaded_file.name)
         with tempfile.NamedTemporaryFile(
             delete=False, 
+            prefix=self.TEMP_FILE_PREFIX,
             suffix=f".{file_extension}"
         ) as tmp_file:
-            tmp_file.write(uploaded_file.getvalue())
+            tmp_file.write(uploaded_file.getbuffer())
             return tmp_file.name
     
     def get_file_extension(self, filename: str) -> str:
@@ -36,14 +71,43 @@ class FileHandler:
         """
         return filename.split('.')[-1].lower()
     
-    def cleanup_temp_file(self, file_path: str):
+    def cleanup_temp_file(self, file_path: Union[str, BinaryIO]):
         """
         Clean up temporary file.
         
         Args:
-            file_path: Path to the temporary file to clean up
+            file_path: Path to the temporary file to clean up, or the in-memory buffer to release
         """
-        if os.path.exists(file_path):
+        if not isinstance(file_path, str):
+            file_path.close()
+        elif os.path.exists(file_path):
             os.unlink(file_path)
     
+    @classmethod
+    def cleanup_stale_temp_files(cls, max_age_hours: float = 24) -> int:
+        """
+        Remove temporary upload files left behind by crashed or killed processes.
+        
+        Args:
+            max_age_hours: Only files older than this are removed, so uploads
+                still being processed by another process are kept
+                
+        Returns:
+            int: Number of files removed
+        """
+        temp_dir = tempfile.gettempdir()
+        cutoff = time.time() - max_age_hours * 3600
+        removed = 0
+        for name in os.listdir(temp_dir):
+            if not name.startswith(cls.TEMP_FILE_PREFIX):
+                continue
+            path = os.path.join(temp_dir, name)
+            try:
+                if os.path.isfile(path) and os.path.getmtime(path) < cutoff:
+                    os.unlink(path)
+                    removed += 1
+            except OSError:
+                # Removed concurrently or not ours to remove
+                continue
+        return removed
     
\ No newline at end of file
@@ -0,0 +1,151 @@
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional
+
+from .document_extractor import DocumentSource
+from .summary_result import SummaryResult
+
+
+@dataclass
+class SummaryJob:
+    """State of one background summarization, polled by the UI."""
+    job_id: str
+    key: str
+    filename: str
+    status: str = "queued"  # queued, running, done or failed
+    progress_current: int = 0
+    progress_total: int = 1
+    progress_text: str = ""
+    partial_summary: str = ""
+    result: Optional[SummaryResult] = None
+    created: float = field(default_factory=time.time)
+    finished: Optional[float] = None
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in ("done", "failed")
+
+
+class JobManager:
+    """Runs document summarization on worker threads, outside Streamlit reruns.
+
+    Jobs live in a process-wide store, so a rerun, a reconnecting browser tab
+    or another session uploading the same file picks up the running or
+    finished job instead of starting over. Finished jobs are kept for
+    result_ttl seconds.
+    """
+
+    def __init__(self, max_workers: int = 2, result_ttl: float = 3600):
+        """
+        Initialize the job manager.
+
+        Args:
+            max_workers: Number of documents summarized concurrently
+            result_ttl: Seconds finished jobs are kept for reconnecting sessions
+        """
+        self.result_ttl = result_ttl
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="summary-job")
+        self._jobs: Dict[str, SummaryJob] = {}
+        self._jobs_by_key: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def submit_document(self, summarizer, key: str, filename: str, file_path: DocumentSource,
+                        file_type: str, custom_prompt: Optional[str] = None,
+                        cleanup: Optional[Callable[[DocumentSource], Any]] = None,
+                        stage_timings: Optional[Dict[str, float]] = None) -> SummaryJob:
+        """
+        Queue a document for summarization, or return the job already handling it.
+
+        Args:
+            summarizer: ResumeSummarizer to run the job with
+            key: Deduplication key (file content, model and prompt)
+            filename: Original filename, for display
+            file_path: Path to the saved document, or an in-memory buffer
+            file_type: File extension without the dot
+            custom_prompt: Optional prompt overriding the one in settings
+            cleanup: Called with file_path once the job no longer needs the file
+            stage_timings: Timings measured by the caller (e.g. saving the upload) to add to the result
+
+        Returns:
+            SummaryJob: The new or existing job
+        """
+        with self._lock:
+            self._evict_expired()
+            existing = self._jobs.get(self._jobs_by_key.get(key, ""))
+            if existing is not None and existing.status != "failed":
+                if cleanup:
+                    cleanup(file_path)
+                return existing
+
+            job = SummaryJob(job_id=uuid.uuid4().hex, key=key, filename=filename)
+            self._jobs[job.job_id] = job
+            self._jobs_by_key[key] = job.job_id
+
+        self._executor.submit(
+            self._run, job, summarizer, file_path, file_type, custom_prompt, cleanup, stage_timings or {}
+        )
+        return job
+
+    def get(self, job_id: Optional[str]) -> Optional[SummaryJob]:
+        """
+        Look up a job by id.
+
+        Args:
+            job_id: Id returned by submit_document
+
+        Returns:
+            Optional[SummaryJob]: The job, or None if unknown or expired
+        """
+        with self._lock:
+            self._evict_expired()
+            return self._jobs.get(job_id or "")
+
+    def _run(self, job: SummaryJob, summarizer, file_path: DocumentSource, file_type: str,
+             custom_prompt: Optional[str], cleanup: Optional[Callable[[DocumentSource], Any]],
+             stage_timings: Dict[str, float]):
+        def progress_callback(current, total, text):
+            job.progress_current, job.progress_total, job.progress_text = current, total, text
+
+        job.status = "running"
+        try:
+            if summarizer.stream:
+                stream = summarizer.stream_document(
+                    file_path, file_type, progress_callback, custom_prompt, source=job.filename
+                )
+                for token in stream:
+                    job.partial_summary += token
+                result = stream.result
+            else:
+                result = summarizer.process_document(
+                    file_path, file_type, progress_callback, custom_prompt, source=job.filename
+                )
+        except Exception as e:
+            result = SummaryResult(
+                summary="",
+                model_used="",
+                processing_time=0.0,
+                success=False,
+                error=str(e)
+            )
+        finally:
+            if cleanup:
+                cleanup(file_path)
+
+        result.stage_timings.update(stage_timings)
+        job.result = result
+        job.finished = time.time()
+        job.status = "done" if result.success else "failed"
+
+    def _evict_expired(self):
+        now = time.time()
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.finished is not None and now - job.finished > self.result_ttl
+        ]
+        for job_id in expired:
+            job = self._jobs.pop(job_id)
+            if self._jobs_by_key.get(job.key) == job_id:
+                del self._jobs_by_key[job.key]
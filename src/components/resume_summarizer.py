@@ -1,11 +1,32 @@
-import ollama
-import pdfplumber
-from docx import Document
+import asyncio
+import copy
+import itertools
+import math
 import re
+import threading
 import time
-from typing import Optional, List, Dict, Any
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import closing
+from typing import Optional, List, Dict, Any, Union, Tuple, Generator, Iterable, Iterator, Set
 
 from .summary_result import SummaryResult
+from .summary_stream import SummaryStream
+from .document_extractor import DocumentExtractor, DocumentSource, ExtractionStats
+from .text_reducer import ReductionStats, TextReducer
+from src.utils.hedging import HedgePolicy
+from src.utils.metrics import OLLAMA_USAGE_FIELDS, ProcessingTrace, metrics_registry
+from src.utils.ollama_pool import NoHealthyEndpointError, OllamaPool
+from src.utils.prompt_template import PromptTemplate, compile_prompt, prompt_source
+from src.utils.similarity_index import SimilarityIndex
+from src.utils.summary_cache import SummaryCache
+
+
+_WHITESPACE = re.compile(r'\s+')
+_SENTENCE_END = re.compile(r'(?<=[.!?])\s+')
+_NUM_CTX_PARAMETER = re.compile(r'^\s*num_ctx\s+(\d+)', re.MULTILINE)
+# Stands in for the document in the system message of the prefix prompt layout
+_DOCUMENT_REFERENCE = "(the resume/CV text is provided in the next message)"
+_UNSUPPORTED_CHARS = re.compile(r'[^\w\s\.\,\!\?\;\:\-\(\)\[\]\{\}\@\#\$\%\^\&\*\+\=\~\`\'\"\/\\\<\>]')
 
 
 class ResumeSummarizer:
@@ -19,15 +40,64 @@ class ResumeSummarizer:
         self.temperature = model_settings.get('temperature', 0.2)
         self.max_tokens = model_settings.get('max_tokens', 600)
         self.chunk_size = model_settings.get('chunk_size', 3000)
+        self.max_parallel_chunks = model_settings.get('max_parallel_chunks', 4)
+        self.reduce_strategy = model_settings.get('reduce_strategy', 'flat')
+        self.reduce_fan_in = model_settings.get('reduce_fan_in', 4)
+        self.stream = model_settings.get('stream', False)
+        self.chunk_strategy = model_settings.get('chunk_strategy', 'characters')
+        self.chars_per_token = model_settings.get('chars_per_token', 4)
+        self.chunk_overlap_tokens = model_settings.get('chunk_overlap_tokens', 0)
+        self.context_window = model_settings.get('context_window')
+        self.max_context_window = model_settings.get('max_context_window', 8192)
+        self.adaptive_num_predict = model_settings.get('adaptive_num_predict', False)
+        self.num_predict_margin = model_settings.get('num_predict_margin', 1.3)
+        self.early_stop = model_settings.get('early_stop', False)
+        self.prompt_layout = model_settings.get('prompt_layout', 'inline')
         self.min_summary_length = summary_settings.get('min_length', 430)
         self.max_summary_length = summary_settings.get('max_length', 500)
         
         # Ollama configuration
-        self.ollama_base_url = ollama_settings.get('base_url', 'http://localhost:11434')
         self.ollama_timeout = ollama_settings.get('timeout', 60)
+        self.model_list_ttl = ollama_settings.get('model_list_ttl', 30)
+        self.keep_alive = ollama_settings.get('keep_alive', '30m')
+        self.model_status_ttl = ollama_settings.get('model_status_ttl', 10)
+        self.ollama_settings = ollama_settings
+        
+        # Warm-up bookkeeping, shared with copies from with_model
+        self._warmup_lock = threading.Lock()
+        self._warming_models: Set[str] = set()
+        # Whether each model was resident when last checked: model -> (monotonic time, loaded)
+        self._model_residency: Dict[str, Tuple[float, bool]] = {}
+        
+        # Characters per generated token, learned per model from responses
+        self._response_chars_per_token: Dict[str, float] = {}
         
         # Store settings for prompt generation
         self.settings = settings
+        # Compiled prompts with the summary length filled in, by (name, custom prompt)
+        self._prompt_templates: Dict[Tuple[str, Optional[str]], PromptTemplate] = {}
+        
+        # Context window sizes per model, from the show endpoint
+        self._context_windows: Dict[str, int] = {}
+        
+        # Text extraction
+        self.extractor = DocumentExtractor(settings)
+        
+        # Removal of repeated headers, contact blocks and low-value sections
+        self.reducer = TextReducer(settings)
+        
+        # Persistent summary cache (None when disabled)
+        self.cache = SummaryCache.from_settings(settings)
+        
+        # Near-duplicate CV index (None when disabled)
+        self.similarity_index = SimilarityIndex.from_settings(settings)
+        self.duplicate_mode = settings.get('similarity_settings', {}).get('mode', 'reuse')
+        
+        # Hedged model calls (None when disabled); streamed calls race to their first
+        # token, so they keep their own latencies and budget
+        self.hedge_policy = HedgePolicy.from_settings(settings)
+        self.stream_hedge_policy = HedgePolicy.from_settings(settings)
+        self.hedge_fallback_model = settings.get('hedge_settings', {}).get('fallback_model')
         
         # Configure Ollama client
         self._configure_ollama_client()
@@ -36,79 +106,227 @@ class ResumeSummarizer:
         self.model = self._select_best_model()
     
     def _configure_ollama_client(self):
-        """Configure Ollama client with custom endpoint if specified."""
-        if hasattr(self, 'ollama_base_url') and self.ollama_base_url != 'http://localhost:11434':
-            import os
-            os.environ['OLLAMA_HOST'] = self.ollama_base_url
+        """Create the pool of Ollama endpoints (one per server in ollama_settings.endpoints).
+        
+        Each summarizer owns its pool, so instances pointing at different
+        hosts can live in the same process. Connections are kept alive and
+        reused by concurrent requests. ``client`` is the first endpoint's
+        client, for calls that need no routing.
+        """
+        self.ollama_pool = OllamaPool.from_settings(self.ollama_settings)
+        self.ollama_base_url = self.ollama_pool.primary.base_url
+        self.client = self.ollama_pool.primary.client
     
     def _select_best_model(self) -> str:
-        try:
-            models = ollama.list()
-            if models and hasattr(models, 'models'):
-                available_models = [model.model for model in models.models]
-                
-                # Return first available model
-                if available_models:
-                    return available_models[0]
-        except Exception:
-            pass
+        available_models = self.get_available_models()
+        
+        # Return first available model
+        if available_models:
+            return available_models[0]
         
         # No models available
         raise RuntimeError("No Ollama models available. Please run: ollama pull <model>")
     
-    def extract_text_from_pdf(self, file_path: str) -> str:
-        text = ""
-        try:
-            with pdfplumber.open(file_path) as pdf:
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text += page_text + "\n"
-        except Exception as e:
-            raise RuntimeError(f"Error processing PDF: {str(e)}")
-        return text
+    def extract_text_from_pdf(self, file_path: DocumentSource) -> str:
+        return self.extractor.extract_text_from_pdf(file_path)
     
-    def extract_text_from_docx(self, file_path: str) -> str:
-        try:
-            doc = Document(file_path)
-            text = ""
-            for paragraph in doc.paragraphs:
-                text += paragraph.text + "\n"
-            return text
-        except Exception as e:
-            raise RuntimeError(f"Error processing DOCX: {str(e)}")
+    def extract_text_from_docx(self, file_path: DocumentSource) -> str:
+        return self.extractor.extract_text_from_docx(file_path)
     
     def preprocess_text(self, text: str) -> str:
-        # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text)
-        # Remove empty lines
-        text = re.sub(r'\n\s*\n', '\n', text)
-        # Remove special characters that might cause issues
-        text = re.sub(r'[^\w\s\.\,\!\?\;\:\-\(\)\[\]\{\}\@\#\$\%\^\&\*\+\=\~\`\'\"\/\\\<\>]', '', text)
-        return text.strip()
+        return "".join(self.iter_preprocessed([text]))
+    
+    def iter_preprocessed(self, pieces: Iterable[str]) -> Iterator[str]:
+        """Normalize a stream of text pieces (pages, paragraphs) incrementally.
+        
+        Pieces are treated as separate lines. The concatenated output equals
+        collapsing all whitespace to single spaces, removing unsupported
+        characters and stripping the ends of the joined text.
+        """
+        started = False
+        held_space = ""
+        
+        for piece in pieces:
+            # Each piece ends a line, so it always ends in a collapsed space;
+            # drop the leading one that would merge with the previous piece
+            segment = _WHITESPACE.sub(' ', piece + "\n")
+            if started and segment.startswith(' '):
+                segment = segment[1:]
+            segment = _UNSUPPORTED_CHARS.sub('', segment)
+            
+            if not started:
+                segment = segment.lstrip()
+            
+            # Hold trailing spaces back until more text follows them
+            content = segment.rstrip()
+            if content:
+                yield held_space + content
+                started = True
+                held_space = segment[len(content):]
+            else:
+                held_space += segment if started else ""
     
     def chunk_text(self, text: str) -> List[str]:
-        words = text.split()
-        chunks = []
+        return list(self.iter_chunks([text]))
+    
+    def iter_chunks(self, segments: Iterable[str]) -> Iterator[str]:
         current_chunk = []
         current_length = 0
+        partial_word = ""
         
-        for word in words:
-            current_chunk.append(word)
-            current_length += len(word) + 1  # +1 for space
+        for segment in segments:
+            segment = partial_word + segment
+            words = segment.split()
             
-            if current_length >= self.chunk_size:
-                chunks.append(' '.join(current_chunk))
-                current_chunk = []
-                current_length = 0
+            # A word may continue in the next segment
+            partial_word = words.pop() if words and not segment[-1].isspace() else ""
+            
+            for word in words:
+                current_chunk.append(word)
+                current_length += len(word) + 1  # +1 for space
+                
+                if current_length >= self.chunk_size:
+                    yield ' '.join(current_chunk)
+                    current_chunk = []
+                    current_length = 0
         
+        if partial_word:
+            current_chunk.append(partial_word)
         if current_chunk:
-            chunks.append(' '.join(current_chunk))
+            yield ' '.join(current_chunk)
+    
+    def estimate_tokens(self, text: str) -> int:
+        return math.ceil(len(text) / self.chars_per_token)
+    
+    def iter_token_chunks(self, segments: Iterable[str], max_tokens: int,
+                          overlap_tokens: int = 0) -> Iterator[str]:
+        """Pack whole sentences into chunks of at most max_tokens (approximate).
         
-        return chunks
+        Each new chunk starts with up to overlap_tokens of trailing sentences
+        from the previous one. Sentences longer than a chunk are split on
+        word boundaries.
+        """
+        max_chars = max(1, int(max_tokens * self.chars_per_token))
+        overlap_chars = int(overlap_tokens * self.chars_per_token)
+        current: List[str] = []
+        current_length = 0
+        
+        for sentence in self._iter_sentences(segments, max_chars):
+            for piece in self._split_long_sentence(sentence, max_chars):
+                if current and current_length + 1 + len(piece) > max_chars:
+                    yield ' '.join(current)
+                    current = self._overlap_tail(current, overlap_chars)
+                    current_length = len(' '.join(current))
+                    if current and current_length + 1 + len(piece) > max_chars:
+                        current, current_length = [], 0
+                
+                current_length += len(piece) + (1 if current else 0)
+                current.append(piece)
+        
+        if current:
+            yield ' '.join(current)
     
+    @staticmethod
+    def _iter_sentences(segments: Iterable[str], max_chars: int) -> Iterator[str]:
+        buffer = ""
+        for segment in segments:
+            buffer += segment
+            sentences = _SENTENCE_END.split(buffer)
+            buffer = sentences.pop()
+            
+            # Text without sentence punctuation (e.g. skill lists) is released
+            # at a word boundary so the buffer stays bounded
+            if len(buffer) > max_chars and ' ' in buffer:
+                head, buffer = buffer.rsplit(' ', 1)
+                sentences.append(head)
+            
+            for sentence in sentences:
+                if sentence.strip():
+                    yield sentence.strip()
         
+        if buffer.strip():
+            yield buffer.strip()
+    
+    @staticmethod
+    def _split_long_sentence(sentence: str, max_chars: int) -> Iterator[str]:
+        if len(sentence) <= max_chars:
+            yield sentence
+            return
         
+        current = ""
+        for word in sentence.split():
+            while len(word) > max_chars:
+                if current:
+                    yield current
+                    current = ""
+                yield word[:max_chars]
+                word = word[max_chars:]
+            if current and len(current) + 1 + len(word) > max_chars:
+                yield current
+                current = ""
+            current = f"{current} {word}" if current else word
+        if current:
+            yield current
+    
+    @staticmethod
+    def _overlap_tail(sentences: List[str], overlap_chars: int) -> List[str]:
+        tail = []
+        length = 0
+        for sentence in reversed(sentences):
+            length += len(sentence) + (1 if tail else 0)
+            if length > overlap_chars:
+                break
+            tail.insert(0, sentence)
+        return tail
+    
+    def get_context_window(self, model: str = None) -> int:
+        model = model or self.model
+        if self.context_window:
+            return self.context_window
+        if model not in self._context_windows:
+            self._context_windows[model] = self._query_context_window(model)
+        return self._context_windows[model]
+    
+    def _query_context_window(self, model: str) -> int:
+        try:
+            endpoints = self.ollama_pool.endpoints_for(model) or [self.ollama_pool.primary]
+            info = endpoints[0].client.show(model)
+            
+            # An explicit num_ctx in the Modelfile is what the server will use
+            match = _NUM_CTX_PARAMETER.search(info.get('parameters') or '')
+            if match:
+                return int(match.group(1))
+            
+            # Otherwise request the trained context length, capped to bound memory use
+            model_info = info.get('modelinfo') or info.get('model_info') or {}
+            for key, value in model_info.items():
+                if key.endswith('.context_length'):
+                    return min(int(value), self.max_context_window)
+        except Exception:
+            pass
+        
+        # Ollama's default context size
+        return 2048
+    
+    def _document_token_budget(self, custom_prompt: str = None, prompt_names: Tuple[str, ...] = ("summary",)) -> int:
+        """Tokens of document text that fit in one call next to the prompt and the response."""
+        template_tokens = max(
+            self.estimate_tokens(self._prompt_template(custom_prompt, name).render(document_text=""))
+            for name in prompt_names
+        )
+        available = self.get_context_window() - template_tokens - self.max_tokens
+        # Keep a margin for the rough chars-per-token estimate
+        return max(int(available * 0.9), 128)
+    
+    def _iter_model_chunks(self, segments: Iterable[str], custom_prompt: str = None) -> Iterator[str]:
+        if self.chunk_strategy == 'tokens':
+            # A chunk is sent with the map prompt, or the summary prompt if it is the only one
+            return self.iter_token_chunks(
+                segments, self._document_token_budget(custom_prompt, ("summary", "map")),
+                self.chunk_overlap_tokens
+            )
+        return self.iter_chunks(segments)
+    
     def _ensure_summary_length(self, summary: str) -> str:
         if len(summary) < self.min_summary_length:
             # If too short, pad with a standard ending
@@ -132,29 +350,71 @@ class ResumeSummarizer:
         
         return summary.strip()
     
-    def _generate_summary_with_fallback(self, text: str, prompt: str) -> SummaryResult:
+    def _num_predict(self) -> int:
+        """Decode budget: enough tokens for max_length characters plus a margin, capped at max_tokens.
+        
+        Anything past max_length is cut by _ensure_summary_length, so
+        decoding up to max_tokens mostly produces text that is thrown away.
+        """
+        if not self.adaptive_num_predict:
+            return self.max_tokens
+        chars_per_token = self._response_chars_per_token.get(self.model, self.chars_per_token)
+        budget = math.ceil(self.max_summary_length / chars_per_token * self.num_predict_margin)
+        return max(16, min(self.max_tokens, budget))
+    
+    def _learn_chars_per_token(self, chars: int, tokens: int):
+        if chars <= 0 or tokens <= 0:
+            return
+        observed = min(max(chars / tokens, 1.0), 10.0)
+        previous = self._response_chars_per_token.get(self.model)
+        # Exponential moving average, so one odd response doesn't swing the budget
+        self._response_chars_per_token[self.model] = (
+            observed if previous is None else 0.8 * previous + 0.2 * observed
+        )
+    
+    def _chat_options(self) -> Dict[str, Any]:
+        options = {
+            "temperature": self.temperature,
+            "num_predict": self._num_predict()
+        }
+        if self.chunk_strategy == 'tokens':
+            # Chunks are sized for this window, so make sure the server allocates it
+            options["num_ctx"] = self.get_context_window()
+        return options
+    
+    def _generate_summary_with_fallback(self, text: str, messages: List[Dict[str, str]]) -> SummaryResult:
         start_time = time.time()
         last_error = None
         
         try:
-            response = ollama.chat(
-                model=self.model,
-                messages=[{"role": "user", "content": prompt}],
-                options={
-                    "temperature": self.temperature,
-                    "num_predict": self.max_tokens
-                }
-            )
+            options = self._chat_options()
+            hedge = {}
+            if self.hedge_policy is not None:
+                response, endpoint, model_used, hedge = self._chat_hedged(messages, options)
+            else:
+                response, endpoint = self._chat(messages, options)
+                model_used = self.model
+            
+            self._mark_loaded(model_used)
+            call_seconds = time.time() - start_time
             
-            summary = response['message']['content']
-            summary = self._ensure_summary_length(summary)
+            post_process_start = time.perf_counter()
+            raw_summary = response['message']['content']
+            summary = self._ensure_summary_length(raw_summary)
             processing_time = time.time() - start_time
+            llm_call = self._llm_call_record(
+                response, call_seconds, raw_summary, summary, options["num_predict"], messages
+            )
+            llm_call['endpoint'] = endpoint.base_url
+            llm_call.update(hedge)
             
             return SummaryResult(
                 summary=summary,
-                model_used=self.model,
+                model_used=model_used,
                 processing_time=processing_time,
-                success=True
+                success=True,
+                stage_timings={'post_process': time.perf_counter() - post_process_start},
+                llm_calls=[llm_call]
             )
             
         except Exception as e:
@@ -169,26 +429,405 @@ class ResumeSummarizer:
             error=str(last_error)
         )
     
-    def generate_summary(self, text: str, custom_prompt: str = None) -> SummaryResult:
+    def _chat(self, messages: List[Dict[str, str]], options: Dict[str, Any]):
+        """Send a non-streaming chat call to the least-loaded endpoint with the model.
+        
+        If the endpoint fails (connection error or 5xx), the call is retried
+        once on each other healthy endpoint before the error is raised.
+        Returns the response and the endpoint that produced it.
+        """
+        tried = set()
+        last_error = None
+        while True:
+            try:
+                with self.ollama_pool.acquire(self.model, exclude=tried) as endpoint:
+                    response = endpoint.client.chat(
+                        model=self.model,
+                        messages=messages,
+                        options=options,
+                        keep_alive=self.keep_alive
+                    )
+                return response, endpoint
+            except NoHealthyEndpointError:
+                if last_error is not None:
+                    raise last_error
+                raise
+            except Exception as e:
+                if not OllamaPool.is_endpoint_failure(e):
+                    raise
+                tried.add(endpoint.base_url)
+                last_error = e
+    
+    def _chat_hedged(self, messages: List[Dict[str, str]], options: Dict[str, Any]):
+        """Chat call that sends a duplicate request if the first one is unusually slow.
+        
+        Once the call has run longer than the policy's latency percentile, a
+        hedge goes to another endpoint with the model or, failing that, to
+        the fallback model, as long as the extra-load budget allows. Both
+        calls stream as tasks on a private event loop, so the loser's task is
+        cancelled as soon as the winner finishes. That aborts its request
+        even while the server is stalled, which makes Ollama stop generating
+        and frees the endpoint. Returns the winning response, its endpoint
+        and model, and hedge fields for the call record.
+        """
+        outcome = asyncio.run(self._race_hedged(messages, options))
+        if outcome is None:
+            # Failed outright rather than slowly: retry on the other endpoints instead
+            response, endpoint = self._chat(messages, options)
+            return response, endpoint, self.model, {}
+        return outcome
+    
+    async def _race_hedged(self, messages: List[Dict[str, str]], options: Dict[str, Any]):
+        """Run the primary call, plus the hedge once it is slow; None if the primary alone failed."""
+        policy = self.hedge_policy
+        policy.start_call()
+        started = time.perf_counter()
+        primary_endpoint: Dict[str, Any] = {}
+        primary = asyncio.ensure_future(
+            self._streamed_chat(self.model, messages, options, (), primary_endpoint)
+        )
+        calls = {primary: False}
+        
         try:
-            # Use custom prompt if provided, otherwise use prompt from settings
-            prompt = custom_prompt or self.settings.get('prompt', '')
+            delay = policy.delay()
+            if delay is not None:
+                done, _ = await asyncio.wait([primary], timeout=delay)
+                if not done:
+                    target = self._hedge_target(policy, primary_endpoint.get('endpoint'))
+                    if target is not None:
+                        model, exclude = target
+                        calls[asyncio.ensure_future(self._streamed_chat(model, messages, options, exclude))] = True
             
-            if not prompt:
-                return SummaryResult(
-                    summary="",
-                    model_used="",
-                    processing_time=0.0,
-                    success=False,
-                    error="No prompt configured in settings"
+            pending = set(calls)
+            last_error = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    try:
+                        response, endpoint, model, seconds = task.result()
+                    except Exception as e:
+                        last_error = e
+                        continue
+                    policy.record(seconds)
+                    if calls[task]:
+                        # The cancelled primary would have taken at least this long
+                        policy.record(time.perf_counter() - started, censored=True)
+                    hedge_fields = {}
+                    if len(calls) > 1:
+                        hedge_fields = {'hedged': True, 'hedge_won': calls[task]}
+                        metrics_registry.increment("hedges_total", help_text="Hedged model calls",
+                                                   winner="hedge" if calls[task] else "primary")
+                    return response, endpoint, model, hedge_fields
+        finally:
+            # Wait for the cancelled losers, so their requests are closed and endpoints released
+            for task in calls:
+                task.cancel()
+            await asyncio.gather(*calls, return_exceptions=True)
+        
+        if len(calls) == 1 and OllamaPool.is_endpoint_failure(last_error):
+            return None
+        raise last_error
+    
+    def _hedge_target(self, policy: HedgePolicy, primary_endpoint=None) -> Optional[Tuple[str, Tuple[str, ...]]]:
+        """Model and excluded endpoints for a hedge, or None if there is nowhere to send it or no budget."""
+        model, exclude = self.model, ()
+        if primary_endpoint is not None:
+            exclude = (primary_endpoint.base_url,)
+        other_endpoints = [e for e in self.ollama_pool.endpoints_for(model) if e.base_url not in exclude]
+        if not other_endpoints:
+            # The same server would likely be just as slow; try the fallback model instead
+            model, exclude = self.hedge_fallback_model, ()
+            if not model or model == self.model or not self.ollama_pool.endpoints_for(model):
+                metrics_registry.increment("hedges_skipped_total", help_text="Hedges not sent",
+                                           reason="no_target")
+                return None
+        
+        if not policy.try_hedge():
+            metrics_registry.increment("hedges_skipped_total", help_text="Hedges not sent", reason="budget")
+            return None
+        return model, exclude
+    
+    async def _streamed_chat(self, model: str, messages: List[Dict[str, str]], options: Dict[str, Any],
+                             exclude: Iterable[str] = (), chosen: Optional[Dict[str, Any]] = None):
+        """Run one chat call as a stream; cancelling the task aborts the request.
+        
+        Returns a response shaped like a non-streaming one, the endpoint, the
+        model and the call's duration.
+        """
+        start_time = time.perf_counter()
+        chosen = chosen if chosen is not None else {}
+        parts = []
+        final_part = {}
+        async for part in self._chat_parts(model, messages, options, exclude, chosen):
+            parts.append(part['message']['content'])
+            if part.get('done'):
+                final_part = part
+        
+        response = {key: final_part.get(key) for key in OLLAMA_USAGE_FIELDS}
+        response['message'] = {'content': "".join(parts)}
+        return response, chosen['endpoint'], model, time.perf_counter() - start_time
+    
+    async def _chat_parts(self, model: str, messages: List[Dict[str, str]], options: Dict[str, Any],
+                          exclude: Iterable[str] = (), chosen: Optional[Dict[str, Any]] = None):
+        """Stream one chat call's parts; the endpoint counts as busy until the stream ends or is closed."""
+        with self.ollama_pool.acquire(model, exclude=exclude) as endpoint:
+            if chosen is not None:
+                chosen['endpoint'] = endpoint
+            async with endpoint.async_client() as client:
+                stream = await client.chat(
+                    model=model,
+                    messages=messages,
+                    options=options,
+                    keep_alive=self.keep_alive,
+                    stream=True
                 )
+                async for part in stream:
+                    yield part
+    
+    def _stream_chat(self, messages: List[Dict[str, str]], options: Dict[str, Any],
+                     call: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """Stream a chat call's parts, hedged and retried until its first part arrives.
+        
+        The call runs on a private event loop driven from this generator.
+        If it fails before its first part, it is retried once on each other
+        healthy endpoint, like _chat. Once the first part has been produced
+        errors are raised, as tokens have already been passed on. ``call``
+        receives the endpoint, model and hedge fields of the call that won.
+        Closing the generator aborts the request, which makes Ollama stop
+        decoding.
+        """
+        loop = asyncio.new_event_loop()
+        parts = None
+        try:
+            tried: Set[str] = set()
+            last_error = None
+            while parts is None:
+                tried_before = len(tried)
+                try:
+                    first_part, parts = loop.run_until_complete(self._race_first_part(messages, options, tried, call))
+                except NoHealthyEndpointError:
+                    if last_error is not None:
+                        raise last_error
+                    raise
+                except Exception as e:
+                    if not OllamaPool.is_endpoint_failure(e) or len(tried) == tried_before:
+                        raise
+                    last_error = e
             
-            # Replace placeholders with actual text and length settings
-            prompt = prompt.replace("{document_text}", text)
-            prompt = prompt.replace("{min_length}", str(self.min_summary_length))
-            prompt = prompt.replace("{max_length}", str(self.max_summary_length))
+            yield first_part
+            while True:
+                try:
+                    part = loop.run_until_complete(parts.__anext__())
+                except StopAsyncIteration:
+                    return
+                yield part
+        finally:
+            if parts is not None:
+                loop.run_until_complete(parts.aclose())
+            # Also closes the client's own stream, as asyncio.run would
+            loop.run_until_complete(loop.shutdown_asyncgens())
+            loop.close()
+    
+    async def _race_first_part(self, messages: List[Dict[str, str]], options: Dict[str, Any],
+                               tried: Set[str], call: Dict[str, Any]):
+        """Start a streamed call, plus a hedge if no part has arrived within the first-part delay.
+        
+        Whichever call produces a part first is kept and the other is
+        cancelled. Endpoints whose call failed are added to ``tried``.
+        Returns the first part and the winning stream.
+        """
+        policy = self.stream_hedge_policy
+        if policy is not None:
+            policy.start_call()
+        started = time.perf_counter()
+        # First-part task -> (stream, chosen endpoint, model, is_hedge, start time)
+        calls = {}
+        
+        def start(model, exclude, is_hedge):
+            chosen = {}
+            stream = self._chat_parts(model, messages, options, exclude, chosen)
+            calls[asyncio.ensure_future(stream.__anext__())] = (stream, chosen, model, is_hedge, time.perf_counter())
+        
+        start(self.model, tried, False)
+        primary = next(iter(calls))
+        winner = None
+        try:
+            delay = policy.delay() if policy is not None else None
+            if delay is not None:
+                done, _ = await asyncio.wait([primary], timeout=delay)
+                if not done:
+                    target = self._hedge_target(policy, calls[primary][1].get('endpoint'))
+                    if target is not None:
+                        start(*target, True)
+            
+            pending = set(calls)
+            last_error = None
+            while pending and winner is None:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    chosen = calls[task][1]
+                    try:
+                        first_part = task.result()
+                    except Exception as e:
+                        if 'endpoint' in chosen and OllamaPool.is_endpoint_failure(e):
+                            tried.add(chosen['endpoint'].base_url)
+                        last_error = e
+                        continue
+                    winner = task
+                    break
+            if winner is None:
+                raise last_error
             
-            return self._generate_summary_with_fallback(text, prompt)
+            stream, chosen, model, is_hedge, call_started = calls[winner]
+            call.update(endpoint=chosen['endpoint'], model=model, hedge={})
+            if policy is not None:
+                policy.record(time.perf_counter() - call_started)
+                if is_hedge:
+                    # The cancelled primary would have taken at least this long
+                    policy.record(time.perf_counter() - started, censored=True)
+            if len(calls) > 1:
+                call['hedge'] = {'hedged': True, 'hedge_won': is_hedge}
+                metrics_registry.increment("hedges_total", help_text="Hedged model calls",
+                                           winner="hedge" if is_hedge else "primary")
+            return first_part, stream
+        finally:
+            losers = [task for task in calls if task is not winner]
+            for task in losers:
+                task.cancel()
+            await asyncio.gather(*losers, return_exceptions=True)
+            for task in losers:
+                await calls[task][0].aclose()
+    
+    def _generate_summary_stream(self, text: str, custom_prompt: str = None,
+                                 prompt_name: str = "summary") -> Generator[str, None, SummaryResult]:
+        start_time = time.time()
+        parts = []
+        length = 0
+        final_part = {}
+        stopped_early = False
+        
+        try:
+            messages = self._build_messages(text, custom_prompt, prompt_name)
+            options = self._chat_options()
+            call = {}
+            # Closing the stream aborts the request, which makes Ollama stop decoding
+            with closing(self._stream_chat(messages, options, call)) as stream:
+                for part in stream:
+                    token = part['message']['content']
+                    if token:
+                        parts.append(token)
+                        length += len(token)
+                        yield token
+                    if part.get('done'):
+                        # Token counts and timings arrive with the last chunk
+                        final_part = part
+                    elif self.early_stop and length > self.max_summary_length:
+                        # Once past max_length the kept text ends at the last sentence
+                        # boundary before it, so later tokens can't change the summary
+                        stopped_early = True
+                        break
+                    
+        except Exception as e:
+            return SummaryResult(
+                summary="",
+                model_used="",
+                processing_time=time.time() - start_time,
+                success=False,
+                error=str(e)
+            )
+        
+        self._mark_loaded(call['model'])
+        call_seconds = time.time() - start_time
+        
+        # Length rules apply to the complete text, not to the streamed tokens
+        post_process_start = time.perf_counter()
+        raw_summary = "".join(parts)
+        summary = self._ensure_summary_length(raw_summary)
+        llm_call = self._llm_call_record(
+            final_part, call_seconds, raw_summary, summary, options["num_predict"], messages,
+            streamed_tokens=len(parts), stopped_early=stopped_early
+        )
+        llm_call['endpoint'] = call['endpoint'].base_url
+        llm_call.update(call['hedge'])
+        return SummaryResult(
+            summary=summary,
+            model_used=call['model'],
+            processing_time=time.time() - start_time,
+            success=True,
+            stage_timings={'post_process': time.perf_counter() - post_process_start},
+            llm_calls=[llm_call]
+        )
+    
+    def _llm_call_record(self, response, seconds: float, raw_summary: str, summary: str,
+                         num_predict: int, messages: List[Dict[str, str]], streamed_tokens: int = 0,
+                         stopped_early: bool = False) -> Dict[str, Any]:
+        record = {'seconds': seconds}
+        for key in OLLAMA_USAGE_FIELDS:
+            record[key] = response.get(key)
+        if record['eval_count'] is None and streamed_tokens:
+            # A stream closed early has no final counts; Ollama sends about one token per chunk
+            record['eval_count'] = streamed_tokens
+        
+        if record['eval_count']:
+            self._learn_chars_per_token(len(raw_summary), record['eval_count'])
+        chars_per_token = self._response_chars_per_token.get(self.model, self.chars_per_token)
+        
+        record.update(
+            # Compared with prompt_eval_count, shows how much of the prompt Ollama
+            # served from its KV cache instead of evaluating
+            prompt_tokens_estimate=self.estimate_tokens("".join(m["content"] for m in messages)),
+            num_predict=num_predict,
+            stopped_early=stopped_early,
+            # Decode budget no longer reserved compared with max_tokens
+            num_predict_saved=self.max_tokens - num_predict,
+            # Tokens decoded and then cut by the length rules
+            discarded_tokens=math.ceil(max(0, len(raw_summary) - len(summary)) / chars_per_token)
+        )
+        return record
+    
+    def _prompt_template(self, custom_prompt: str = None, name: str = "summary") -> PromptTemplate:
+        """Compiled prompt with the summary length filled in, parsed once per summarizer.
+        
+        name selects the "map" or "reduce" prompt of the prompts settings,
+        which fall back to the custom prompt or the settings' prompt.
+        """
+        key = (name, custom_prompt)
+        template = self._prompt_templates.get(key)
+        if template is None:
+            template = compile_prompt(prompt_source(self.settings, name, custom_prompt)).bind(
+                min_length=self.min_summary_length,
+                max_length=self.max_summary_length
+            )
+            self._prompt_templates[key] = template
+        return template
+    
+    def _build_prompt(self, text: str, custom_prompt: str = None, prompt_name: str = "summary") -> str:
+        # Single pass, so placeholder-like text in the CV is left alone
+        return self._prompt_template(custom_prompt, prompt_name).render(document_text=text)
+    
+    def _build_messages(self, text: str, custom_prompt: str = None,
+                        prompt_name: str = "summary") -> List[Dict[str, str]]:
+        """Chat messages for one call, laid out according to prompt_layout.
+        
+        "inline" sends the filled-in template as a single user message.
+        "prefix" sends every static part of the template as the system
+        message and the document alone as the user message. The system
+        message is then byte-identical across documents, so Ollama can reuse
+        its KV cache for it and only prefill the new document.
+        """
+        if self.prompt_layout != 'prefix':
+            return [{"role": "user", "content": self._build_prompt(text, custom_prompt, prompt_name)}]
+        
+        instructions = self._build_prompt(_DOCUMENT_REFERENCE, custom_prompt, prompt_name)
+        return [
+            {"role": "system", "content": instructions},
+            {"role": "user", "content": text}
+        ]
+    
+    def generate_summary(self, text: str, custom_prompt: str = None, prompt_name: str = "summary") -> SummaryResult:
+        try:
+            messages = self._build_messages(text, custom_prompt, prompt_name)
+            return self._generate_summary_with_fallback(text, messages)
             
         except Exception as e:
             return SummaryResult(
@@ -199,14 +838,231 @@ class ResumeSummarizer:
                 error=str(e)
             )
     
-    def process_document(self, file_path: str, file_type: str, 
-                        progress_callback=None, custom_prompt: str = None) -> SummaryResult:
-        # Extract text based on file type
-        if file_type == "pdf":
-            text = self.extract_text_from_pdf(file_path)
-        elif file_type == "docx":
-            text = self.extract_text_from_docx(file_path)
-        else:
+    def stream_summary(self, text: str, custom_prompt: str = None) -> SummaryStream:
+        return SummaryStream(self._generate_summary_stream(text, custom_prompt))
+    
+    def _resolve_prompt(self, custom_prompt: str = None) -> str:
+        return self._prompt_template(custom_prompt).source
+    
+    def _cache_key(self, content_hash: str, custom_prompt: str = None) -> str:
+        return SummaryCache.make_key(
+            content_hash,
+            model=self.model,
+            prompt=self._resolve_prompt(custom_prompt),
+            prompts=self.settings.get('prompts') or {},
+            model_settings=self.settings.get('model_settings', {}),
+            summary_settings=self.settings.get('summary_settings', {}),
+            reduction_settings=self.settings.get('reduction_settings', {}),
+            # Only the extraction settings that change the text sent to the model
+            extraction_settings={
+                'max_pages': self.extractor.max_pages,
+                'max_chars': self.extractor.max_chars,
+                'docx_engine': self.extractor.docx_engine
+            }
+        )
+    
+    def get_cache_stats(self) -> Dict[str, int]:
+        if self.cache is None:
+            return {}
+        return self.cache.stats()
+    
+    def _lookup_cache(self, content_hash: Optional[str],
+                      custom_prompt: str = None) -> Tuple[Optional[str], Optional[SummaryResult]]:
+        if self.cache is None or content_hash is None:
+            return None, None
+        cache_key = self._cache_key(content_hash, custom_prompt)
+        return cache_key, self.cache.get(cache_key)
+    
+    def _content_hash(self, file_path: DocumentSource) -> Optional[str]:
+        if self.cache is None:
+            return None
+        return SummaryCache.hash_file(file_path)
+    
+    def process_document(self, file_path: DocumentSource, file_type: str, 
+                        progress_callback=None, custom_prompt: str = None,
+                        source: str = None) -> SummaryResult:
+        trace = ProcessingTrace()
+        with trace.stage("cache_lookup"):
+            cache_key, cached_result = self._lookup_cache(self._content_hash(file_path), custom_prompt)
+        if cached_result is not None:
+            return self._finish(trace, cached_result)
+        
+        pieces = self._iter_document_pieces(file_path, file_type, trace)
+        if isinstance(pieces, SummaryResult):
+            return self._finish(trace, pieces)
+        
+        return self._summarize_and_store(
+            pieces, cache_key, progress_callback, custom_prompt, trace,
+            source=source or self._document_name(file_path)
+        )
+    
+    def summarize_text(self, text: Union[str, List[str]], progress_callback=None, custom_prompt: str = None,
+                       content_hash: str = None, source: str = None) -> SummaryResult:
+        """Summarize already extracted text.
+        
+        Used by callers that extract documents elsewhere (e.g. in worker
+        processes). text may also be the list of a PDF's page texts, which lets
+        the reduction stage find headers repeated across pages. Passing the
+        source file's content_hash enables the cache; source names the
+        document in the near-duplicate index.
+        """
+        trace = ProcessingTrace()
+        with trace.stage("cache_lookup"):
+            cache_key, cached_result = self._lookup_cache(content_hash, custom_prompt)
+        if cached_result is not None:
+            return self._finish(trace, cached_result)
+        
+        return self._summarize_and_store(
+            [text] if isinstance(text, str) else text, cache_key, progress_callback, custom_prompt, trace,
+            source=source
+        )
+    
+    def _summarize_and_store(self, pieces: Iterable[str], cache_key: Optional[str],
+                             progress_callback=None, custom_prompt: str = None,
+                             trace: ProcessingTrace = None, source: str = None) -> SummaryResult:
+        trace = trace or ProcessingTrace()
+        pieces, signature, duplicate = self._find_near_duplicate(pieces, custom_prompt, trace)
+        if duplicate is not None:
+            return self._finish(trace, duplicate)
+        
+        final_input = self._prepare_final_input(pieces, progress_callback, custom_prompt, trace)
+        if isinstance(final_input, SummaryResult):
+            return self._finish(trace, final_input)
+        
+        stage = self._final_stage(trace)
+        with trace.stage(stage):
+            result = self.generate_summary(final_input, custom_prompt, self._final_prompt_name(stage))
+        trace.add_calls(stage, result.llm_calls)
+        
+        if cache_key is not None:
+            self.cache.put(cache_key, result)
+        self._index_summary(signature, result, custom_prompt, source)
+        return self._finish(trace, result)
+    
+    def _find_near_duplicate(self, pieces: Iterable[str], custom_prompt: str, trace: ProcessingTrace
+                             ) -> Tuple[Iterable[str], Optional[int], Optional[SummaryResult]]:
+        """Look the document up in the near-duplicate index before any model call.
+        
+        The extracted pieces are buffered (CVs are small) so they can be
+        hashed and then still run through the normal pipeline on a miss.
+        The match has to be known before any model call, so this gives up
+        overlapping extraction with the map phase; hence the index is opt-in.
+        Returns the pieces to summarize, the document's SimHash and, on a
+        match, the result to return instead.
+        """
+        if self.similarity_index is None:
+            return pieces, None, None
+        
+        with trace.stage("extract"):
+            pieces = list(pieces)
+        with trace.stage("similarity"):
+            hasher = self.similarity_index.hasher()
+            for segment in self.iter_preprocessed(pieces):
+                hasher.update(segment)
+            signature = hasher.digest()
+            match = None
+            if signature is not None:
+                match = self.similarity_index.find(signature, self._cache_key("", custom_prompt))
+        
+        if match is None:
+            return pieces, signature, None
+        
+        duplicate_of = {'similarity': match['similarity'], 'source': match['source']}
+        if self.duplicate_mode == 'flag':
+            return pieces, signature, SummaryResult(
+                summary="",
+                model_used="",
+                processing_time=0.0,
+                success=False,
+                error=f"Near-duplicate of a previously summarized CV ({match['similarity']:.0%} similar)",
+                duplicate_of=duplicate_of
+            )
+        return pieces, signature, SummaryResult(
+            summary=match['summary'],
+            model_used=match['model_used'],
+            processing_time=0.0,
+            success=True,
+            cached=True,
+            duplicate_of=duplicate_of
+        )
+    
+    def _index_summary(self, signature: Optional[int], result: SummaryResult,
+                       custom_prompt: str = None, source: str = None):
+        if signature is None or not result.success:
+            return
+        # Parameters only, so a match requires the same model, prompt and settings
+        self.similarity_index.add(
+            signature, self._cache_key("", custom_prompt), result.summary, result.model_used, source
+        )
+    
+    @staticmethod
+    def _final_stage(trace: ProcessingTrace) -> str:
+        # After a map phase the final call reduces chunk summaries
+        return "reduce" if "map" in trace.stage_timings else "summarize"
+    
+    @staticmethod
+    def _final_prompt_name(stage: str) -> str:
+        # The final call of a mapped document merges chunk summaries
+        return "reduce" if stage == "reduce" else "summary"
+    
+    @staticmethod
+    def _finish(trace: ProcessingTrace, result: SummaryResult) -> SummaryResult:
+        """Attach the trace to the result and record it in the process-wide metrics."""
+        trace.apply(result)
+        metrics_registry.record_result(result)
+        return result
+    
+    def stream_document(self, file_path: DocumentSource, file_type: str, progress_callback=None,
+                        custom_prompt: str = None, source: str = None) -> SummaryStream:
+        return SummaryStream(
+            self._stream_document(file_path, file_type, progress_callback, custom_prompt, source)
+        )
+    
+    def _stream_document(self, file_path: DocumentSource, file_type: str, progress_callback=None,
+                         custom_prompt: str = None,
+                         source: str = None) -> Generator[str, None, SummaryResult]:
+        trace = ProcessingTrace()
+        with trace.stage("cache_lookup"):
+            cache_key, cached_result = self._lookup_cache(self._content_hash(file_path), custom_prompt)
+        if cached_result is not None:
+            yield cached_result.summary
+            return self._finish(trace, cached_result)
+        
+        pieces = self._iter_document_pieces(file_path, file_type, trace)
+        if isinstance(pieces, SummaryResult):
+            return self._finish(trace, pieces)
+        
+        pieces, signature, duplicate = self._find_near_duplicate(pieces, custom_prompt, trace)
+        if duplicate is not None:
+            if duplicate.success:
+                yield duplicate.summary
+            return self._finish(trace, duplicate)
+        
+        final_input = self._prepare_final_input(pieces, progress_callback, custom_prompt, trace)
+        if isinstance(final_input, SummaryResult):
+            return self._finish(trace, final_input)
+        
+        # Time spent by the caller rendering tokens counts towards this stage
+        stage = self._final_stage(trace)
+        with trace.stage(stage):
+            result = yield from self._generate_summary_stream(
+                final_input, custom_prompt, self._final_prompt_name(stage)
+            )
+        trace.add_calls(stage, result.llm_calls)
+        
+        if cache_key is not None:
+            self.cache.put(cache_key, result)
+        self._index_summary(signature, result, custom_prompt, source or self._document_name(file_path))
+        return self._finish(trace, result)
+    
+    @staticmethod
+    def _document_name(file_path: DocumentSource) -> Optional[str]:
+        # In-memory documents have no name of their own
+        return file_path if isinstance(file_path, str) else None
+    
+    def _iter_document_pieces(self, file_path: DocumentSource, file_type: str,
+                              trace: ProcessingTrace = None) -> Union[Iterator[str], SummaryResult]:
+        if file_type not in DocumentExtractor.SUPPORTED_FILE_TYPES:
             return SummaryResult(
                 summary="Unsupported file type",
                 model_used="",
@@ -214,8 +1070,53 @@ class ResumeSummarizer:
                 success=False,
                 error="Unsupported file type"
             )
+        stats = ExtractionStats(paged=file_type == "pdf")
+        if trace is not None:
+            # Skipped pages are copied onto the result once extraction has finished
+            trace.extraction = stats
+        return self.extractor.iter_text(file_path, file_type, stats)
+    
+    def _prepare_final_input(self, pieces: Iterable[str], progress_callback=None,
+                             custom_prompt: str = None,
+                             trace: ProcessingTrace = None) -> Union[str, SummaryResult]:
+        """Stream extracted text through preprocessing and chunking.
         
-        if not text:
+        Extraction, normalization and chunking are lazy, so the map phase can
+        start on the first chunk while later pages are still being parsed.
+        Returns the text for the final summarization call, or a failed
+        SummaryResult.
+        
+        Because the stages are lazy, each timed iterator also measures the
+        stages it pulls from; the trace is made exclusive once they finish.
+        """
+        trace = trace or ProcessingTrace()
+        started = dict(trace.stage_timings)
+        try:
+            return self._map_document(pieces, progress_callback, custom_prompt, trace)
+        finally:
+            trace.exclusive("map", "chunk", started)
+            trace.exclusive("chunk", "preprocess", started)
+            if "trim" in trace.stage_timings:
+                trace.exclusive("preprocess", "trim", started)
+                trace.exclusive("trim", "extract", started)
+            else:
+                trace.exclusive("preprocess", "extract", started)
+    
+    def _map_document(self, pieces: Iterable[str], progress_callback, custom_prompt: str,
+                      trace: ProcessingTrace) -> Union[str, SummaryResult]:
+        pieces = trace.timed_iter(pieces, "extract")
+        if self.reducer.enabled:
+            stats = ReductionStats(chars_per_token=self.chars_per_token)
+            trace.reduction = stats
+            # Text passed in directly (summarize_text) is pages or a single piece
+            paged = trace.extraction is None or trace.extraction.paged
+            pieces = trace.timed_iter(self.reducer.iter_reduced(pieces, stats, paged), "trim")
+        preprocessed = self.iter_preprocessed(pieces)
+        chunks = self._iter_model_chunks(trace.timed_iter(preprocessed, "preprocess"), custom_prompt)
+        chunks = trace.timed_iter(chunks, "chunk")
+        first_chunk = next(chunks, None)
+        
+        if first_chunk is None:
             return SummaryResult(
                 summary="No text could be extracted from the document",
                 model_used="",
@@ -224,41 +1125,231 @@ class ResumeSummarizer:
                 error="No text extracted"
             )
         
-        # Preprocess text
-        text = self.preprocess_text(text)
+        second_chunk = next(chunks, None)
+        if second_chunk is None:
+            # Single chunk processing
+            return first_chunk
+        
+        all_chunks = itertools.chain([first_chunk, second_chunk], chunks)
+        with trace.stage("map"):
+            summaries = self._summarize_chunks(
+                all_chunks, progress_callback, custom_prompt, trace=trace, trace_stage="map"
+            )
+        if isinstance(summaries, SummaryResult):
+            # If any chunk fails, return the error
+            return summaries
+        
+        if self.reduce_strategy == 'tree':
+            with trace.stage("reduce"):
+                summaries = self._tree_reduce(summaries, progress_callback, custom_prompt, trace)
+            if isinstance(summaries, SummaryResult):
+                return summaries
         
-        # Check if text needs to be chunked
-        if len(text) > self.chunk_size:
-            chunks = self.chunk_text(text)
-            summaries = []
+        # Combine summaries for the final summary of summaries
+        return "\n\n".join(summaries)
+    
+    def _tree_reduce(self, summaries: List[str], progress_callback=None, custom_prompt: str = None,
+                     trace: ProcessingTrace = None) -> Union[List[str], SummaryResult]:
+        """Merge intermediate summaries level by level until one final call can take them.
+        
+        Each level groups up to reduce_fan_in summaries (fewer if they would
+        overflow the context budget) and merges the groups concurrently, so
+        the number of levels grows logarithmically with the chunk count.
+        """
+        level = 1
+        while True:
+            groups = self._group_summaries(summaries, custom_prompt)
+            if len(groups) == 1:
+                return groups[0]
             
-            for i, chunk in enumerate(chunks):
-                if progress_callback:
-                    progress_callback(i + 1, len(chunks), f"Processing chunk {i+1}/{len(chunks)}")
-                
-                chunk_result = self.generate_summary(chunk, custom_prompt)
-                if chunk_result.success:
-                    summaries.append(chunk_result.summary)
-                else:
-                    # If any chunk fails, return the error
-                    return chunk_result
+            # A group of one needs no merge call; it moves up a level as is
+            merged = self._summarize_chunks(
+                ("\n\n".join(group) for group in groups if len(group) > 1),
+                progress_callback,
+                custom_prompt,
+                stage=f"level {level} merge",
+                trace=trace,
+                trace_stage="reduce"
+            )
+            if isinstance(merged, SummaryResult):
+                return merged
             
-            # Combine summaries
-            combined_summary = "\n\n".join(summaries)
+            merged_iter = iter(merged)
+            summaries = [group[0] if len(group) == 1 else next(merged_iter) for group in groups]
+            level += 1
+    
+    def _group_summaries(self, summaries: List[str], custom_prompt: str = None) -> List[List[str]]:
+        fan_in = max(2, self.reduce_fan_in)
+        max_tokens = None
+        if self.chunk_strategy == 'tokens':
+            max_tokens = self._document_token_budget(custom_prompt, ("reduce",))
+        
+        groups: List[List[str]] = []
+        group_tokens = 0
+        for summary in summaries:
+            tokens = self.estimate_tokens(summary)
+            starts_group = not groups or len(groups[-1]) >= fan_in
+            # Always pair at least two summaries so every level shrinks
+            if not starts_group and max_tokens and len(groups[-1]) >= 2:
+                starts_group = group_tokens + tokens > max_tokens
             
-            # Generate final summary of summaries
-            return self.generate_summary(combined_summary, custom_prompt)
-        else:
-            # Single chunk processing
-            return self.generate_summary(text, custom_prompt)
+            if starts_group:
+                groups.append([summary])
+                group_tokens = tokens
+            else:
+                groups[-1].append(summary)
+                group_tokens += tokens
+        return groups
     
-    def get_available_models(self) -> List[str]:
+    def _summarize_chunks(self, chunks: Iterable[str], progress_callback=None,
+                          custom_prompt: str = None, stage: str = "chunk",
+                          trace: ProcessingTrace = None,
+                          trace_stage: str = "map") -> Union[List[str], SummaryResult]:
+        """Map phase: summarize chunks concurrently, keeping input order.
+        
+        Chunks are consumed lazily and at most twice max_parallel_chunks are
+        in flight, so a long document is never fully buffered. Progress is
+        reported from the calling thread, so callbacks that touch Streamlit
+        elements stay on the script thread. The first failed chunk cancels
+        the pending ones and is returned.
+        """
+        chunk_iter = iter(chunks)
+        max_in_flight = 2 * max(1, self.max_parallel_chunks)
+        executor = ThreadPoolExecutor(max_workers=max(1, self.max_parallel_chunks))
+        summaries: Dict[int, str] = {}
+        in_flight = {}
+        submitted = 0
+        exhausted = False
+        
         try:
-            models = ollama.list()
-            if models and hasattr(models, 'models'):
-                return [model.model for model in models.models]
-        except Exception:
-            pass
-        return []
+            while True:
+                while not exhausted and len(in_flight) < max_in_flight:
+                    chunk = next(chunk_iter, None)
+                    if chunk is None:
+                        exhausted = True
+                        break
+                    # trace_stage ("map" or "reduce") also selects the prompt
+                    in_flight[executor.submit(self.generate_summary, chunk, custom_prompt, trace_stage)] = submitted
+                    submitted += 1
+                    if progress_callback:
+                        progress_callback(len(summaries), submitted, f"Processing {stage} {submitted}")
+                
+                if not in_flight:
+                    break
+                
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index = in_flight.pop(future)
+                    chunk_result = future.result()
+                    if trace is not None:
+                        trace.add_calls(trace_stage, chunk_result.llm_calls)
+                    if not chunk_result.success:
+                        return chunk_result
+                    
+                    summaries[index] = chunk_result.summary
+                    if progress_callback:
+                        progress_callback(
+                            len(summaries), submitted, f"Processed {stage} {len(summaries)}/{submitted}"
+                        )
+        finally:
+            for future in in_flight:
+                future.cancel()
+            executor.shutdown(wait=False)
+        
+        return [summaries[i] for i in range(submitted)]
+    
+    def get_available_models(self) -> List[str]:
+        # The pool is shared with copies from with_model and relists endpoints after model_list_ttl
+        return self.ollama_pool.available_models()
+    
+    def get_endpoint_stats(self) -> List[Dict[str, Any]]:
+        """Health, in-flight calls, call counts and latency of each Ollama endpoint."""
+        return self.ollama_pool.stats()
+    
+    def warm_up(self, model: str = None) -> bool:
+        """Load a model into server memory so the first summary skips the cold load.
+        
+        An empty generate request loads the model and keeps it resident for
+        keep_alive without producing any tokens.
+        """
+        model = model or self.model
+        options = {}
+        if self.chunk_strategy == 'tokens':
+            # Load with the context size real requests use, or they would reload the model
+            options["num_ctx"] = self.get_context_window(model)
+        # Every endpoint with the model may be routed to, so load it on all of them
+        loaded = False
+        for endpoint in self.ollama_pool.endpoints_for(model) or [self.ollama_pool.primary]:
+            try:
+                endpoint.client.generate(model=model, prompt="", options=options, keep_alive=self.keep_alive)
+                loaded = True
+            except Exception:
+                continue
+        if loaded:
+            self._mark_loaded(model)
+        return loaded
+    
+    def warm_up_in_background(self, model: str = None):
+        model = model or self.model
+        with self._warmup_lock:
+            if model in self._warming_models:
+                return
+            self._warming_models.add(model)
+        
+        def run():
+            try:
+                self.warm_up(model)
+            finally:
+                with self._warmup_lock:
+                    self._warming_models.discard(model)
+        
+        threading.Thread(target=run, name=f"warm-up-{model}", daemon=True).start()
+    
+    def is_model_loaded(self, model: str = None) -> bool:
+        """Ask the servers whether a model is currently resident in memory."""
+        model = model or self.model
+        for endpoint in self.ollama_pool.endpoints_for(model) or [self.ollama_pool.primary]:
+            try:
+                running = endpoint.probe_client.ps()
+            except Exception:
+                continue
+            if any(m.model == model or m.name == model for m in running.models):
+                return True
+        return False
+    
+    def get_model_status(self, model: str = None) -> str:
+        """Readiness of a model: "loading", "ready" or "cold".
+        
+        Residency comes from the servers (is_model_loaded), so a model they
+        unloaded or lost in a restart shows as cold. The answer is reused for
+        model_status_ttl seconds, as the sidebar asks on every rerun.
+        """
+        model = model or self.model
+        with self._warmup_lock:
+            if model in self._warming_models:
+                return "loading"
+            checked = self._model_residency.get(model)
+        
+        if checked is None or time.monotonic() - checked[0] >= self.model_status_ttl:
+            checked = (time.monotonic(), self.is_model_loaded(model))
+            with self._warmup_lock:
+                self._model_residency[model] = checked
+        return "ready" if checked[1] else "cold"
+    
+    def _mark_loaded(self, model: str):
+        """Record that a call just used a model, so it is resident without asking the server."""
+        with self._warmup_lock:
+            self._model_residency[model] = (time.monotonic(), True)
+    
+    def with_model(self, model: str) -> 'ResumeSummarizer':
+        """Return a lightweight copy using another model.
+        
+        The copy shares the cache, extractor and model metadata with this
+        instance, so a process-wide summarizer can serve sessions that each
+        picked a different model.
+        """
+        summarizer = copy.copy(self)
+        summarizer.model = model
+        return summarizer
     
     
\ No newline at end of file
@@ -1,5 +1,5 @@
-from dataclasses import dataclass
-from typing import Optional
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
 
 
 @dataclass
@@ -9,4 +9,24 @@ class SummaryResult:
     model_used: str
     processing_time: float
     success: bool
-    error: Optional[str] = None
\ No newline at end of file
+    error: Optional[str] = None
+    cached: bool = False
+    # Seconds spent per stage (extract, preprocess, chunk, map, reduce, ...)
+    stage_timings: Dict[str, float] = field(default_factory=dict)
+    # One entry per model call with Ollama's token counts and durations (ns)
+    llm_calls: List[Dict[str, Any]] = field(default_factory=list)
+    # Set when the summary was matched to a near-duplicate CV (similarity, source)
+    duplicate_of: Optional[Dict[str, Any]] = None
+    # 1-based PDF pages not read because of the extraction page limit or text budget
+    skipped_pages: List[int] = field(default_factory=list)
+    # Characters and estimated tokens removed by the reduction stage, per rule
+    reduction: Dict[str, int] = field(default_factory=dict)
+    
+    @property
+    def token_usage(self) -> Dict[str, int]:
+        """Token counts and Ollama durations summed over all model calls."""
+        totals = {'prompt_eval_count': 0, 'eval_count': 0, 'eval_duration': 0, 'load_duration': 0}
+        for call in self.llm_calls:
+            for key in totals:
+                totals[key] += call.get(key) or 0
+        return totals
\ No newline at end of file
@@ -0,0 +1,448 @@
+import asyncio
+import functools
+import hashlib
+import io
+import json
+import math
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from email.parser import BytesParser
+from email.policy import HTTP
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from .document_extractor import DocumentExtractor
+from .summary_result import SummaryResult
+from src.utils.metrics import MetricsRegistry, metrics_registry
+
+
+class QueueFullError(Exception):
+    """Raised when the service queue is full; retry_after is the suggested wait in seconds."""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Summarization queue is full, retry in {retry_after}s")
+        self.retry_after = retry_after
+
+
+class _UnsupportedMediaType(ValueError):
+    pass
+
+
+@dataclass
+class _PendingRequest:
+    key: str
+    run: Callable[[], SummaryResult]
+    future: asyncio.Future
+    enqueued: float = field(default_factory=time.perf_counter)
+
+
+class SummaryService:
+    """Asyncio front end to a ResumeSummarizer that groups requests into batches.
+
+    Requests wait in a bounded queue. A single dispatcher takes up to
+    batch_size of them, waiting at most batch_wait_ms for a batch to fill,
+    and runs the batch on a thread pool of the same size, so Ollama never
+    sees more than batch_size documents at once. Up to max_batches batches
+    run at a time, so the threads a batch has finished with are used by
+    the next one instead of idling behind its slowest document. Identical
+    documents in a batch are summarized once. When the queue is full,
+    submit raises QueueFullError instead of letting latency grow without
+    bound.
+    """
+
+    def __init__(self, summarizer, batch_size: int = 4, batch_wait_ms: float = 20,
+                 queue_size: int = 32, max_batches: int = 2, custom_prompt: Optional[str] = None,
+                 registry: MetricsRegistry = metrics_registry):
+        """
+        Initialize the service.
+
+        Args:
+            summarizer: ResumeSummarizer to run requests with
+            batch_size: Maximum documents summarized concurrently
+            batch_wait_ms: How long the first request of a batch waits for others to join
+            queue_size: Maximum waiting requests before new ones are rejected
+            max_batches: Maximum batches dispatched at once
+            custom_prompt: Optional prompt overriding the one in settings
+            registry: Metrics registry to record service metrics in
+        """
+        self.summarizer = summarizer
+        self.batch_size = max(1, batch_size)
+        self.batch_wait = batch_wait_ms / 1000
+        self.queue_size = max(1, queue_size)
+        self.max_batches = max(1, max_batches)
+        self.custom_prompt = custom_prompt
+        self.registry = registry
+        self._queue: Optional[asyncio.Queue] = None
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._batch_slots: Optional[asyncio.Semaphore] = None
+        self._batches: Set[asyncio.Task] = set()
+        self._executor = ThreadPoolExecutor(max_workers=self.batch_size, thread_name_prefix="summary-service")
+        # Running estimate of how long one batch takes, for Retry-After
+        self._batch_seconds = 1.0
+
+    @property
+    def queued(self) -> int:
+        """Number of requests waiting for a batch."""
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def start(self):
+        """Start the batch dispatcher on the running event loop."""
+        if self._dispatcher is None:
+            self._queue = asyncio.Queue(maxsize=self.queue_size)
+            self._batch_slots = asyncio.Semaphore(self.max_batches)
+            self._dispatcher = asyncio.get_running_loop().create_task(self._dispatch())
+
+    async def stop(self):
+        """Stop the dispatcher; requests still queued or running are cancelled."""
+        if self._dispatcher is not None:
+            self._dispatcher.cancel()
+            try:
+                await self._dispatcher
+            except asyncio.CancelledError:
+                pass
+            self._dispatcher = None
+        for batch in list(self._batches):
+            batch.cancel()
+        await asyncio.gather(*self._batches, return_exceptions=True)
+        while self._queue is not None and not self._queue.empty():
+            self._queue.get_nowait().future.cancel()
+        self._executor.shutdown(wait=False)
+
+    async def summarize_document(self, data: bytes, file_type: str,
+                                 filename: Optional[str] = None) -> SummaryResult:
+        """
+        Summarize an uploaded PDF or DOCX held in memory.
+
+        Args:
+            data: Document bytes
+            file_type: File extension without the dot ("pdf" or "docx")
+            filename: Original filename, recorded as the document's source
+
+        Returns:
+            SummaryResult: Result of the summarization
+        """
+        def run():
+            return self.summarizer.process_document(
+                io.BytesIO(data), file_type, custom_prompt=self.custom_prompt, source=filename
+            )
+
+        key = f"{file_type}:{hashlib.sha256(data).hexdigest()}"
+        return await self._submit(key, run)
+
+    async def summarize_text(self, text: str, source: Optional[str] = None) -> SummaryResult:
+        """
+        Summarize already extracted CV text.
+
+        Args:
+            text: CV text
+            source: Optional description of the document
+
+        Returns:
+            SummaryResult: Result of the summarization
+        """
+        content_hash = hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+        def run():
+            return self.summarizer.summarize_text(
+                text, custom_prompt=self.custom_prompt, content_hash=content_hash, source=source
+            )
+
+        return await self._submit(f"text:{content_hash}", run)
+
+    async def _submit(self, key: str, run: Callable[[], SummaryResult]) -> SummaryResult:
+        if self._queue is None:
+            raise RuntimeError("SummaryService.start() has not been called")
+        request = _PendingRequest(key=key, run=run, future=asyncio.get_running_loop().create_future())
+        try:
+            self._queue.put_nowait(request)
+        except asyncio.QueueFull:
+            self.registry.increment("service_rejected_total", help_text="Requests rejected with 429")
+            raise QueueFullError(self.retry_after())
+        return await request.future
+
+    def retry_after(self) -> int:
+        """
+        Estimate the seconds until the queue has room again.
+
+        Returns:
+            int: Whole seconds, at least 1
+        """
+        batches_ahead = self.queued / self.batch_size
+        return max(1, math.ceil(batches_ahead * self._batch_seconds))
+
+    async def _dispatch(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            await self._batch_slots.acquire()
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.batch_wait
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                # Not wait_for: on older Pythons it can drop an item that arrives as it times out
+                getter = loop.create_task(self._queue.get())
+                done, _ = await asyncio.wait({getter}, timeout=timeout)
+                if not done:
+                    getter.cancel()
+                    try:
+                        batch.append(await getter)
+                    except asyncio.CancelledError:
+                        pass
+                    break
+                batch.append(getter.result())
+            task = loop.create_task(self._run_batch(batch))
+            self._batches.add(task)
+            task.add_done_callback(self._batch_done)
+
+    def _batch_done(self, task: asyncio.Task):
+        self._batches.discard(task)
+        self._batch_slots.release()
+
+    @staticmethod
+    def _resolve(requests: List[_PendingRequest], run: asyncio.Future):
+        for request in requests:
+            if request.future.done():
+                continue
+            if run.cancelled():
+                request.future.cancel()
+            elif run.exception() is not None:
+                request.future.set_exception(run.exception())
+            else:
+                request.future.set_result(run.result())
+
+    async def _run_batch(self, batch: List[_PendingRequest]):
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+
+        # Requests cancelled while queued (the client disconnected) are dropped; duplicates share one run
+        groups: Dict[str, List[_PendingRequest]] = {}
+        for request in batch:
+            if not request.future.done():
+                groups.setdefault(request.key, []).append(request)
+                self.registry.observe("service_queue_seconds", started - request.enqueued,
+                                      help_text="Time requests waited for a batch")
+        if not groups:
+            return
+        self.registry.observe("service_batch_size", len(groups),
+                              help_text="Distinct documents per dispatched batch")
+
+        # Each run answers its requests as soon as it finishes, not when the whole batch has
+        runs = []
+        for requests in groups.values():
+            run = loop.run_in_executor(self._executor, requests[0].run)
+            run.add_done_callback(functools.partial(self._resolve, requests))
+            runs.append(run)
+        await asyncio.gather(*runs, return_exceptions=True)
+
+        seconds = time.perf_counter() - started
+        self._batch_seconds = 0.8 * self._batch_seconds + 0.2 * seconds
+
+
+class SummaryHTTPServer:
+    """Minimal asyncio HTTP/1.1 server exposing a SummaryService.
+
+    Endpoints:
+        POST /summarize: multipart/form-data with a "file" field (PDF or DOCX),
+            application/json {"text": ..., "source": ...}, or a text/plain body.
+            Returns the SummaryResult as JSON.
+        GET /healthz: Liveness and queue depth.
+        GET /metrics, GET /metrics.json: The process metrics registry.
+
+    Each connection serves one request and is then closed.
+    """
+
+    _REASONS = {
+        200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+        409: "Conflict", 411: "Length Required", 413: "Payload Too Large",
+        415: "Unsupported Media Type", 429: "Too Many Requests", 502: "Bad Gateway",
+    }
+
+    def __init__(self, service: SummaryService, host: str = "127.0.0.1", port: int = 8080,
+                 max_body_mb: float = 10):
+        """
+        Initialize the server.
+
+        Args:
+            service: Service handling summarization requests
+            host: Interface to bind
+            port: Port to bind (0 picks a free port)
+            max_body_mb: Largest accepted request body in megabytes
+        """
+        self.service = service
+        self.host = host
+        self.port = port
+        self.max_body = int(max_body_mb * 1024 * 1024)
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self):
+        """Start the service and begin accepting connections."""
+        await self.service.start()
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        # Report the bound port when 0 was requested
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self):
+        """Start if needed and serve until cancelled."""
+        if self._server is None:
+            await self.start()
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.stop()
+
+    async def stop(self):
+        """Stop accepting connections and shut the service down."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        await self.service.stop()
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            status, headers, body = await self._handle_request(reader, writer)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            writer.close()
+            return
+        except Exception as e:
+            status, headers, body = self._json(400, {'error': str(e)})
+
+        head = [f"HTTP/1.1 {status} {self._REASONS.get(status, '')}"]
+        head += [f"{name}: {value}" for name, value in headers.items()]
+        head += [f"Content-Length: {len(body)}", "Connection: close", "", ""]
+        try:
+            writer.write("\r\n".join(head).encode('latin-1') + body)
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _handle_request(self, reader: asyncio.StreamReader,
+                              writer: asyncio.StreamWriter) -> Tuple[int, Dict[str, str], bytes]:
+        request_line = (await reader.readline()).decode('latin-1').strip()
+        if not request_line:
+            raise ConnectionError("Empty request")
+        method, target = request_line.split(" ")[:2]
+        path = target.split("?", 1)[0]
+
+        headers = {}
+        while True:
+            line = (await reader.readline()).decode('latin-1')
+            if line in ("\r\n", "\n", ""):
+                break
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        if path == "/healthz" and method == "GET":
+            summarizer = self.service.summarizer
+            # Asks Ollama when the cached answer is stale, so keep it off the event loop
+            model_status = await asyncio.get_running_loop().run_in_executor(None, summarizer.get_model_status)
+            return self._json(200, {
+                'status': "ok",
+                'model': summarizer.model,
+                'model_status': model_status,
+                'queued': self.service.queued,
+                'endpoints': summarizer.get_endpoint_stats(),
+            })
+        if path == "/metrics" and method == "GET":
+            body = self.service.registry.to_prometheus().encode()
+            return 200, {'Content-Type': "text/plain; version=0.0.4"}, body
+        if path == "/metrics.json" and method == "GET":
+            return self._json(200, self.service.registry.to_json())
+        if path != "/summarize":
+            return self._json(404, {'error': f"Unknown path {path}"})
+        if method != "POST":
+            return self._json(405, {'error': "Use POST"})
+
+        if 'content-length' not in headers:
+            return self._json(411, {'error': "Content-Length is required"})
+        length = int(headers['content-length'])
+        if length > self.max_body:
+            return self._json(413, {'error': f"Request body exceeds {self.max_body} bytes"})
+        body = await reader.readexactly(length)
+
+        summary = asyncio.ensure_future(self._summarize(headers.get('content-type', ''), body))
+        disconnect = asyncio.ensure_future(self._wait_for_disconnect(writer))
+        try:
+            await asyncio.wait({summary, disconnect}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            disconnect.cancel()
+        if not summary.done():
+            # Cancelling the request cancels its queued future, so no model call is spent on it
+            summary.cancel()
+            self.service.registry.increment("service_disconnects_total",
+                                            help_text="Requests abandoned by their client before a response")
+            raise ConnectionError("Client disconnected")
+
+        try:
+            result = summary.result()
+        except QueueFullError as e:
+            return self._json(429, {'error': str(e)}, {'Retry-After': str(e.retry_after)})
+        except _UnsupportedMediaType as e:
+            return self._json(415, {'error': str(e)})
+        except ValueError as e:
+            return self._json(400, {'error': str(e)})
+
+        self.service.registry.increment("service_requests_total", help_text="Requests answered by the HTTP service",
+                                        success=result.success)
+        if result.success:
+            status = 200
+        elif result.duplicate_of is not None:
+            status = 409
+        else:
+            status = 502
+        payload = asdict(result)
+        payload['token_usage'] = result.token_usage
+        return self._json(status, payload)
+
+    @staticmethod
+    async def _wait_for_disconnect(writer: asyncio.StreamWriter):
+        """Return once the connection is lost (e.g. reset by the client).
+
+        End of input is not a disconnect: a client may shut down its sending
+        side after the request (``nc -N``, some proxies) and still wait for
+        the response.
+        """
+        try:
+            await writer.wait_closed()
+        except ConnectionError:
+            pass
+
+    async def _summarize(self, content_type: str, body: bytes) -> SummaryResult:
+        """Dispatch a /summarize body by content type; raises ValueError for unusable input."""
+        media_type = content_type.split(";")[0].strip().lower()
+        if media_type == "multipart/form-data":
+            filename, data = self._parse_upload(content_type, body)
+            file_type = os.path.splitext(filename)[1].lstrip('.').lower()
+            if file_type not in DocumentExtractor.SUPPORTED_FILE_TYPES:
+                raise _UnsupportedMediaType(f"Unsupported file type: {filename}")
+            return await self.service.summarize_document(data, file_type, filename)
+        if media_type == "application/json":
+            payload = json.loads(body or b"{}")
+            if not payload.get('text'):
+                raise ValueError('JSON body must contain a non-empty "text" field')
+            return await self.service.summarize_text(payload['text'], payload.get('source'))
+        if media_type in ("text/plain", ""):
+            text = body.decode('utf-8', errors='replace')
+            if not text.strip():
+                raise ValueError("Request body is empty")
+            return await self.service.summarize_text(text)
+        raise _UnsupportedMediaType(f"Unsupported content type: {media_type}")
+
+    @staticmethod
+    def _parse_upload(content_type: str, body: bytes) -> Tuple[str, bytes]:
+        message = BytesParser(policy=HTTP).parsebytes(
+            f"Content-Type: {content_type}\r\n\r\n".encode('latin-1') + body
+        )
+        for part in message.iter_parts():
+            if part.get_param('name', header='content-disposition') == "file" and part.get_filename():
+                return part.get_filename(), part.get_payload(decode=True)
+        raise ValueError('Multipart body must contain a "file" field with a filename')
+
+    @staticmethod
+    def _json(status: int, payload: Dict[str, Any],
+              headers: Optional[Dict[str, str]] = None) -> Tuple[int, Dict[str, str], bytes]:
+        return status, {'Content-Type': "application/json", **(headers or {})}, json.dumps(payload).encode()
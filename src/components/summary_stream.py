@@ -0,0 +1,34 @@
+from typing import Generator, Iterator, Optional
+
+from .summary_result import SummaryResult
+
+
+class SummaryStream:
+    """Iterable of summary tokens with the final result available afterwards."""
+
+    def __init__(self, generator: Generator[str, None, SummaryResult]):
+        """
+        Initialize the stream.
+
+        Args:
+            generator: Generator yielding tokens and returning a SummaryResult
+        """
+        self._generator = generator
+        self.result: Optional[SummaryResult] = None
+
+    def __iter__(self) -> Iterator[str]:
+        result = yield from self._generator
+        # Iterating again after the end runs the exhausted generator, which returns None
+        if result is not None:
+            self.result = result
+
+    def collect(self) -> SummaryResult:
+        """
+        Consume the remaining tokens.
+
+        Returns:
+            SummaryResult: The final result of the stream
+        """
+        for _ in self:
+            pass
+        return self.result
@@ -0,0 +1,265 @@
+import re
+from dataclasses import dataclass
+from collections import Counter
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+
+# "3", "- 3 -", "Page 3", "Page 3 of 5", "Page 3/5"; not "100%" or "24/7"
+_PAGE_NUMBER = re.compile(
+    r'^\s*-?\s*(page\s*\d{1,3}(\s*(of|/)\s*\d{1,3})?|\d{1,3}(\s+of\s+\d{1,3})?)\s*-?\s*$', re.IGNORECASE
+)
+# Footers like "Confidential - page 2" differ from page to page only in the number
+_PAGE_REFERENCE = re.compile(r'\bpage\s*\d', re.IGNORECASE)
+_REFERENCES_ON_REQUEST = re.compile(
+    r'^\W*references?\s+(are\s+)?(available\s+)?(up)?on\s+request\W*$', re.IGNORECASE
+)
+_EMAIL = re.compile(r'[\w.+-]+@[\w-]+(?:\.[\w-]+)+')
+_PHONE = re.compile(r'(?<![\w/])\+?\(?\d[\d\s().-]{7,}\d(?![\w/])')
+_URL = re.compile(r'\b(?:https?://|www\.)\S+|\b(?:linkedin|github|gitlab)\.com/\S+', re.IGNORECASE)
+_CONTACT_LABEL = re.compile(
+    r'\b(e-?mail|phone|tel|mobile|cell|linkedin|github|gitlab|website|web|portfolio)\b\s*:?',
+    re.IGNORECASE
+)
+_CONTACT_SEPARATORS = re.compile(r'[|•·,;/]+|\s-\s')
+_DIGIT = re.compile(r'\d')
+_SPACES = re.compile(r'\s+')
+_HEADING_PUNCTUATION = re.compile(r'^[\W_]+|[\W_]+$')
+
+# Lower-case section headings common in CVs, used to find where a dropped section ends
+_SECTION_HEADINGS = {
+    'summary', 'profile', 'professional summary', 'personal statement', 'objective', 'about me',
+    'experience', 'work experience', 'professional experience', 'employment', 'employment history',
+    'work history', 'career history', 'education', 'education and training', 'qualifications',
+    'skills', 'technical skills', 'core skills', 'key skills', 'competencies', 'core competencies',
+    'projects', 'certifications', 'certificates', 'licenses and certifications', 'courses', 'training',
+    'languages', 'publications', 'awards', 'honors and awards', 'achievements', 'volunteering',
+    'volunteer experience', 'leadership', 'activities', 'interests', 'hobbies', 'hobbies and interests',
+    'references', 'referees', 'declaration', 'personal details', 'personal information', 'contact',
+    'contact details', 'additional information',
+}
+
+
+@dataclass
+class ReductionStats:
+    """What the reduction stage removed from one document."""
+    chars_in: int = 0
+    chars_out: int = 0
+    repeated_lines: int = 0
+    page_number_lines: int = 0
+    contact_lines: int = 0
+    section_lines: int = 0
+    urls_shortened: int = 0
+    # Used to estimate tokens_removed
+    chars_per_token: float = 4
+
+    @property
+    def chars_removed(self) -> int:
+        return self.chars_in - self.chars_out
+
+    def as_dict(self) -> Dict[str, int]:
+        """
+        Export the counters with an estimate of the prompt tokens saved.
+
+        Returns:
+            Dict[str, int]: Counters plus chars_removed and tokens_removed
+        """
+        return {
+            'chars_in': self.chars_in,
+            'chars_out': self.chars_out,
+            'chars_removed': self.chars_removed,
+            'tokens_removed': round(self.chars_removed / self.chars_per_token),
+            'repeated_lines': self.repeated_lines,
+            'page_number_lines': self.page_number_lines,
+            'contact_lines': self.contact_lines,
+            'section_lines': self.section_lines,
+            'urls_shortened': self.urls_shortened,
+        }
+
+
+class TextReducer:
+    """Removes text that costs prompt tokens without helping the summary.
+
+    Runs on the extracted pieces before normalization and chunking:
+
+    - lines repeated at the same position near the top or bottom of
+      repeat_pages pages (running headers and footers) are dropped from that
+      page on; only page numbers may differ. Known section headings are never
+      dropped this way. Applies to pieces that are pages (PDF) and have at
+      least min_page_lines lines
+    - page numbers ("3", "Page 3 of 5") at the top or bottom of a page are
+      dropped
+    - consecutive contact lines are collapsed into one, contact details
+      already given are dropped, and URLs are shortened to host and path
+    - sections with a heading in drop_sections (e.g. references) are
+      dropped up to the next known section heading
+    """
+
+    def __init__(self, settings: Optional[Dict[str, Any]] = None):
+        """
+        Initialize the reducer.
+
+        Args:
+            settings: Optional application settings dictionary
+        """
+        reduction_settings = (settings or {}).get('reduction_settings', {})
+        self.enabled = reduction_settings.get('enabled', False)
+        self.repeated_lines = reduction_settings.get('repeated_lines', True)
+        self.edge_lines = reduction_settings.get('edge_lines', 3)
+        self.repeat_pages = max(2, reduction_settings.get('repeat_pages', 3))
+        self.min_page_lines = reduction_settings.get('min_page_lines', 4)
+        self.page_numbers = reduction_settings.get('page_numbers', True)
+        self.collapse_contacts = reduction_settings.get('collapse_contacts', True)
+        self.drop_sections = {
+            self._heading_key(heading) for heading in reduction_settings.get('drop_sections', [])
+        }
+
+    def reduce_text(self, text: str, stats: Optional[ReductionStats] = None) -> str:
+        """
+        Reduce a single text (pages already joined, so repeated lines and page numbers are not detected).
+
+        Args:
+            text: Extracted document text
+            stats: Optional ReductionStats to fill in
+
+        Returns:
+            str: Reduced text
+        """
+        return "\n".join(self.iter_reduced([text], stats, paged=False))
+
+    def iter_reduced(self, pieces: Iterable[str], stats: Optional[ReductionStats] = None,
+                     paged: bool = True) -> Iterator[str]:
+        """
+        Reduce a stream of text pieces (pages or paragraphs) incrementally.
+
+        Args:
+            pieces: Extracted text pieces in document order
+            stats: Optional ReductionStats to fill in
+            paged: Whether the pieces are pages; paragraphs are never checked for repeated lines
+                or page numbers
+
+        Returns:
+            Iterator[str]: Non-empty reduced pieces
+        """
+        if not self.enabled:
+            yield from pieces
+            return
+
+        stats = stats if stats is not None else ReductionStats()
+        # Pages each (position, line) has appeared on so far
+        seen_edge_lines: Counter = Counter()
+        seen_contacts: Set[str] = set()
+        dropping_section = False
+
+        for piece in pieces:
+            lines = [line.strip() for line in piece.splitlines()]
+            lines = [line for line in lines if line]
+            stats.chars_in += sum(len(line) for line in lines)
+
+            # Running headers and footers sit at the same place near the top or bottom of each page
+            check_repeats = self.repeated_lines and len(lines) >= self.min_page_lines
+            page_edge_lines = set()
+
+            kept: List[str] = []
+            contact_block: List[str] = []
+            for index, line in enumerate(lines):
+                position = self._edge_position(index, len(lines)) if paged else None
+                # A bare number elsewhere (a table cell, a skill rating) is content
+                if position is not None and self.page_numbers and _PAGE_NUMBER.match(line):
+                    stats.page_number_lines += 1
+                    continue
+
+                heading = self._heading_key(line)
+                if position is not None and check_repeats and heading not in _SECTION_HEADINGS:
+                    key = _SPACES.sub(' ', line.lower())
+                    if _PAGE_REFERENCE.search(key):
+                        key = _DIGIT.sub('0', key)
+                    key = (position, key)
+                    page_edge_lines.add(key)
+                    if seen_edge_lines[key] >= self.repeat_pages - 1:
+                        stats.repeated_lines += 1
+                        continue
+
+                if heading in self.drop_sections:
+                    dropping_section = True
+                elif heading in _SECTION_HEADINGS:
+                    dropping_section = False
+                if dropping_section or (self.drop_sections and _REFERENCES_ON_REQUEST.match(line)):
+                    stats.section_lines += 1
+                    continue
+
+                if self.collapse_contacts:
+                    contacts = self._contact_tokens(line)
+                    if contacts is not None:
+                        for key, text in contacts:
+                            if key not in seen_contacts:
+                                seen_contacts.add(key)
+                                contact_block.append(text)
+                        stats.contact_lines += 1
+                        continue
+                    if contact_block:
+                        kept.append("; ".join(contact_block))
+                        contact_block = []
+                    line = self._shorten_urls(line, stats)
+                kept.append(line)
+
+            if contact_block:
+                kept.append("; ".join(contact_block))
+            seen_edge_lines.update(page_edge_lines)
+
+            stats.chars_out += sum(len(line) for line in kept)
+            if kept:
+                yield "\n".join(kept)
+
+    def _edge_position(self, index: int, line_count: int) -> Optional[int]:
+        """Line position counted from the top (0, 1, ...) or bottom (-1, -2, ...) of a page, None in between."""
+        if index < self.edge_lines:
+            return index
+        if index >= line_count - self.edge_lines:
+            return index - line_count
+        return None
+
+    @staticmethod
+    def _heading_key(line: str) -> str:
+        if len(line) > 40:
+            return ""
+        key = _HEADING_PUNCTUATION.sub('', line.lower()).replace('&', 'and')
+        return _SPACES.sub(' ', key)
+
+    @staticmethod
+    def _normalize_url(url: str) -> str:
+        url = re.sub(r'^(https?://)?(www\.)?', '', url, flags=re.IGNORECASE)
+        return url.split('?', 1)[0].split('#', 1)[0].rstrip('/.,;)')
+
+    def _contact_tokens(self, line: str) -> Optional[List[Tuple[str, str]]]:
+        """(dedup key, text) of each detail on a line that is mostly contact details, else None."""
+        tokens = []
+        for match in _EMAIL.finditer(line):
+            tokens.append((match.group().lower(), match.group()))
+        for match in _URL.finditer(line):
+            if '@' not in match.group():
+                url = self._normalize_url(match.group())
+                tokens.append((url.lower(), url))
+        for match in _PHONE.finditer(line):
+            # Date ranges like "2019 - 2021" have too few digits to be a phone number
+            digits = "".join(_DIGIT.findall(match.group()))
+            if len(digits) >= 9:
+                tokens.append((digits, match.group().strip()))
+        if not tokens:
+            return None
+
+        rest = _PHONE.sub(' ', _URL.sub(' ', _EMAIL.sub(' ', line)))
+        rest = _SPACES.sub(' ', _CONTACT_SEPARATORS.sub(' ', _CONTACT_LABEL.sub(' ', rest))).strip()
+        # A few words (a city, "Remote") may share the line with the details
+        if len(re.findall(r'[^\W\d_]{2,}', rest)) > 3:
+            return None
+        if rest:
+            tokens.insert(0, (rest.lower(), rest))
+        return tokens
+
+    def _shorten_urls(self, line: str, stats: ReductionStats) -> str:
+        def shorten(match):
+            short = self._normalize_url(match.group())
+            if short != match.group():
+                stats.urls_shortened += 1
+            return short
+        return _URL.sub(shorten, line)
@@ -1,3 +1,4 @@
+import os
 import streamlit as st
 from src.utils.app_config import AppConfig
 
@@ -26,8 +27,18 @@ class UI:
         st.sidebar.title("Settings")
         
         # Ollama endpoint info
-        ollama_endpoint = getattr(summarizer, 'ollama_base_url', 'http://localhost:11434')
-        st.sidebar.markdown(f"**Ollama Endpoint:** `{ollama_endpoint}`")
+        endpoint_stats = summarizer.get_endpoint_stats() if hasattr(summarizer, 'get_endpoint_stats') else []
+        if len(endpoint_stats) > 1:
+            st.sidebar.markdown("**Ollama Endpoints:**")
+            for endpoint in endpoint_stats:
+                status = "healthy" if endpoint['healthy'] else "ejected"
+                latency = f", {endpoint['latency_ms']:.0f} ms" if endpoint['latency_ms'] is not None else ""
+                st.sidebar.caption(
+                    f"`{endpoint['base_url']}`: {status}, {endpoint['in_flight']} in flight{latency}"
+                )
+        else:
+            ollama_endpoint = getattr(summarizer, 'ollama_base_url', 'http://localhost:11434')
+            st.sidebar.markdown(f"**Ollama Endpoint:** `{ollama_endpoint}`")
         
         # Model selection
         try:
@@ -40,9 +51,15 @@ class UI:
                     index=available_models.index(summarizer.model) if summarizer.model in available_models else 0
                 )
                 
-                # Update summarizer model if changed
+                # Update summarizer model if changed, loading it before the user clicks
                 if selected_model != summarizer.model:
                     summarizer.model = selected_model
+                    summarizer.warm_up_in_background(selected_model)
+                st.session_state['selected_model'] = selected_model
+                
+                st.sidebar.caption(
+                    AppConfig.MODEL_STATUS_LABELS[summarizer.get_model_status(selected_model)]
+                )
                 
             else:
                 st.sidebar.warning(AppConfig.MESSAGES['no_models_found'])
@@ -51,6 +68,14 @@ class UI:
             st.sidebar.error(f"{AppConfig.MESSAGES['ollama_connection_error']}: {str(e)}")
             st.sidebar.info(AppConfig.MESSAGES['ollama_serve_info'])
     
+        # Summary cache counters
+        cache_stats = summarizer.get_cache_stats()
+        if cache_stats:
+            st.sidebar.caption(
+                f"Summary cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses, "
+                f"{cache_stats['entries']} stored"
+            )
+    
     @staticmethod
     def render_file_uploader():
         """
@@ -136,6 +161,37 @@ class UI:
         """
         st.error(message)
     
+    @staticmethod
+    def render_duplicate_notice(duplicate_of: dict, reused: bool):
+        """
+        Tell the user that the CV matched a previously summarized one.
+        
+        Args:
+            duplicate_of: Match details (similarity, source)
+            reused: Whether the earlier summary is shown instead of a new one
+        """
+        source = os.path.basename(duplicate_of.get('source') or '') or 'an earlier CV'
+        message = f"This CV is {duplicate_of['similarity']:.0%} similar to {source}."
+        if reused:
+            message += " Its summary was reused without calling the model."
+        else:
+            message += " It was not summarized again; review it against the earlier summary."
+        st.info(message)
+    
+    @staticmethod
+    def render_skipped_pages(skipped_pages: list):
+        """
+        Note which PDF pages were left out of the summary.
+        
+        Args:
+            skipped_pages: 1-based numbers of unread pages (a contiguous tail of the document)
+        """
+        if len(skipped_pages) == 1:
+            pages = f"Page {skipped_pages[0]} was"
+        else:
+            pages = f"Pages {skipped_pages[0]}-{skipped_pages[-1]} were"
+        st.caption(f"{pages} not read; the document exceeds the extraction page or text limit.")
+    
     @staticmethod
     def render_instructions():
         """Render usage instructions."""
@@ -20,4 +20,11 @@ class AppConfig:
         'ollama_serve_info': 'Please start Ollama: `ollama serve`',
         'no_models_found': 'No models found. Please run: ollama pull <model>',
         'file_upload_help': 'Upload a CV in PDF or DOCX format'
+    }
+    
+    # Model readiness captions, keyed by ResumeSummarizer.get_model_status
+    MODEL_STATUS_LABELS = {
+        'ready': 'Model loaded and ready',
+        'loading': 'Loading model...',
+        'cold': 'Model not loaded yet; the first summary may take longer'
     }
\ No newline at end of file
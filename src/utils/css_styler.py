@@ -1,5 +1,6 @@
 import streamlit as st
 import os
+from functools import lru_cache
 
 
 class CSSStyler:
@@ -8,11 +9,16 @@ class CSSStyler:
     @staticmethod
     def apply_styles():
         """Apply custom CSS styles to the Streamlit app."""
+        st.markdown(CSSStyler._load_styles(), unsafe_allow_html=True)
+    
+    @staticmethod
+    @lru_cache(maxsize=1)
+    def _load_styles() -> str:
+        """Read the stylesheet once per process and wrap it in style tags."""
         css_file_path = os.path.join(os.path.dirname(__file__), '..', '..', 'static', 'styles.css')
         
         with open(css_file_path, 'r') as f:
             css_content = f.read()
         
         # Wrap CSS in style tags for Streamlit
-        styled_css = f"<style>{css_content}</style>"
-        st.markdown(styled_css, unsafe_allow_html=True)
\ No newline at end of file
+        return f"<style>{css_content}</style>"
\ No newline at end of file
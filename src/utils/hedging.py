@@ -0,0 +1,120 @@
+import threading
+from collections import deque
+from typing import Any, Dict, Optional
+
+
+class HedgePolicy:
+    """Decides when a slow model call gets a duplicate ("hedged") request.
+
+    The hedge delay is a percentile of recent call latencies, so only calls
+    already slower than, say, 95% of recent ones are duplicated. Hedges are
+    also capped at max_extra_load times the number of calls, which bounds the
+    extra work hedging can put on the servers even when every call is slow.
+    """
+
+    def __init__(self, percentile: float = 0.95, min_delay: float = 1.0, max_extra_load: float = 0.1,
+                 window: int = 200, min_samples: int = 20):
+        """
+        Initialize the policy.
+
+        Args:
+            percentile: Latency percentile (as a fraction) after which a call is hedged
+            min_delay: Lower bound for the hedge delay in seconds
+            max_extra_load: Maximum hedges as a fraction of calls
+            window: Number of recent latencies the percentile is computed over
+            min_samples: Latencies needed before hedging starts
+        """
+        self.percentile = percentile
+        self.min_delay = min_delay
+        self.max_extra_load = max_extra_load
+        self.min_samples = max(1, min_samples)
+        self._latencies = deque(maxlen=max(1, window))
+        self._calls = 0
+        self._hedges = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls, settings: Dict[str, Any]) -> Optional["HedgePolicy"]:
+        """
+        Build a policy from the ``hedge_settings`` section of the settings.
+
+        Args:
+            settings: Application settings dictionary
+
+        Returns:
+            HedgePolicy instance, or None when hedging is disabled
+        """
+        hedge_settings = settings.get('hedge_settings', {})
+        if not hedge_settings.get('enabled', False):
+            return None
+        return cls(
+            percentile=hedge_settings.get('percentile', 0.95),
+            min_delay=hedge_settings.get('min_delay', 1.0),
+            max_extra_load=hedge_settings.get('max_extra_load', 0.1),
+            window=hedge_settings.get('window', 200),
+            min_samples=hedge_settings.get('min_samples', 20),
+        )
+
+    def record(self, seconds: float, censored: bool = False):
+        """
+        Record the latency of a call.
+
+        A call cancelled because its hedge won is recorded as censored: it
+        would have taken at least ``seconds``. It still counts as a sample,
+        otherwise only the winners' latencies are seen and the delay drifts
+        below the real percentile.
+
+        Args:
+            seconds: Call duration, or time until it was cancelled
+            censored: Whether the call was cancelled before it finished
+        """
+        with self._lock:
+            self._latencies.append(seconds)
+
+    def delay(self) -> Optional[float]:
+        """
+        Seconds to wait for a response before hedging.
+
+        Returns:
+            Optional[float]: The delay, or None while too few latencies are known
+        """
+        with self._lock:
+            if len(self._latencies) < self.min_samples:
+                return None
+            ordered = sorted(self._latencies)
+        index = min(len(ordered) - 1, int(self.percentile * len(ordered)))
+        return max(self.min_delay, ordered[index])
+
+    def start_call(self):
+        """Count a call that may be hedged."""
+        with self._lock:
+            self._calls += 1
+
+    def try_hedge(self) -> bool:
+        """
+        Reserve a hedge if the extra-load budget allows it.
+
+        Returns:
+            bool: True if the caller may send a hedge
+        """
+        with self._lock:
+            if self._hedges + 1 > self.max_extra_load * self._calls:
+                return False
+            self._hedges += 1
+            return True
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Current delay and load counters.
+
+        Returns:
+            Dict with calls, hedges, extra_load and delay
+        """
+        with self._lock:
+            calls, hedges = self._calls, self._hedges
+        return {
+            'calls': calls,
+            'hedges': hedges,
+            'extra_load': hedges / calls if calls else 0.0,
+            'delay': self.delay(),
+        }
@@ -0,0 +1,358 @@
+import json
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+# Ollama response fields collected for every model call
+OLLAMA_USAGE_FIELDS = (
+    'prompt_eval_count', 'prompt_eval_duration', 'eval_count', 'eval_duration',
+    'load_duration', 'total_duration'
+)
+
+_LabelKey = Tuple[Tuple[str, str], ...]
+
+
+class ProcessingTrace:
+    """Collects per-stage timings and model calls while one document is processed.
+
+    Map calls run on worker threads, so all updates are locked.
+    """
+
+    def __init__(self):
+        """Initialize an empty trace."""
+        self.stage_timings: Dict[str, float] = {}
+        self.llm_calls: List[Dict[str, Any]] = []
+        # ExtractionStats of the document, when it was extracted in this trace
+        self.extraction = None
+        # ReductionStats of the document, when the reduction stage ran
+        self.reduction = None
+        self._lock = threading.Lock()
+
+    def add_time(self, stage: str, seconds: float):
+        """
+        Add time spent in a stage.
+
+        Args:
+            stage: Stage name (e.g. "extract", "map")
+            seconds: Elapsed seconds to add
+        """
+        with self._lock:
+            self.stage_timings[stage] = self.stage_timings.get(stage, 0.0) + seconds
+
+    @contextmanager
+    def stage(self, stage: str):
+        """Time the body of a with-block as the given stage."""
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(stage, time.perf_counter() - start_time)
+
+    def timed_iter(self, iterable: Iterable[Any], stage: str) -> Iterator[Any]:
+        """
+        Wrap an iterator, charging the time spent producing each item to a stage.
+
+        The time is inclusive of any iterator it pulls from; see exclusive().
+
+        Args:
+            iterable: Iterator to wrap
+            stage: Stage name to charge
+        """
+        iterator = iter(iterable)
+        while True:
+            start_time = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                self.add_time(stage, time.perf_counter() - start_time)
+                return
+            self.add_time(stage, time.perf_counter() - start_time)
+            yield item
+
+    def exclusive(self, stage: str, inner_stage: str, since: Optional[Dict[str, float]] = None):
+        """
+        Subtract an inner pipeline stage's time from the stage that pulls from it.
+
+        Args:
+            stage: Outer stage measured inclusively
+            inner_stage: Stage it pulled from
+            since: Snapshot of stage_timings taken when the pipeline started, so
+                inner time recorded before then is not subtracted
+        """
+        with self._lock:
+            if stage in self.stage_timings and inner_stage in self.stage_timings:
+                inner = self.stage_timings[inner_stage] - (since or {}).get(inner_stage, 0.0)
+                self.stage_timings[stage] = max(0.0, self.stage_timings[stage] - inner)
+
+    def add_calls(self, stage: str, calls: List[Dict[str, Any]]):
+        """
+        Record model calls made for a stage.
+
+        Args:
+            stage: Stage name ("map", "reduce" or "summarize")
+            calls: Call records from SummaryResult.llm_calls
+        """
+        with self._lock:
+            for call in calls:
+                self.llm_calls.append({**call, 'stage': stage})
+
+    def apply(self, result):
+        """
+        Copy the collected timings, calls, skipped pages and reduction stats onto a SummaryResult.
+
+        Args:
+            result: SummaryResult of the final call
+
+        Returns:
+            The same SummaryResult
+        """
+        with self._lock:
+            for stage, seconds in result.stage_timings.items():
+                self.stage_timings[stage] = self.stage_timings.get(stage, 0.0) + seconds
+            result.stage_timings = dict(self.stage_timings)
+            result.llm_calls = list(self.llm_calls)
+            if self.extraction is not None:
+                result.skipped_pages = list(self.extraction.skipped_pages)
+            if self.reduction is not None:
+                result.reduction = self.reduction.as_dict()
+        return result
+
+
+class MetricsRegistry:
+    """Process-wide counters and latency histograms with Prometheus and JSON export."""
+
+    DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+    def __init__(self, prefix: str = "cv_summarizer"):
+        """
+        Initialize the registry.
+
+        Args:
+            prefix: Prefix for exported metric names
+        """
+        self.prefix = prefix
+        self._counters: Dict[str, Dict[_LabelKey, float]] = {}
+        self._histograms: Dict[str, Dict[_LabelKey, Dict[str, Any]]] = {}
+        self._help: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _label_key(labels: Dict[str, Any]) -> _LabelKey:
+        return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+    def increment(self, name: str, amount: float = 1, help_text: str = "", **labels):
+        """
+        Increase a counter.
+
+        Args:
+            name: Metric name without prefix
+            amount: Amount to add
+            help_text: Description used in the Prometheus export
+            **labels: Label values
+        """
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            key = self._label_key(labels)
+            series[key] = series.get(key, 0) + amount
+            if help_text:
+                self._help.setdefault(name, help_text)
+
+    def observe(self, name: str, value: float, help_text: str = "", **labels):
+        """
+        Record a value (usually seconds) in a histogram.
+
+        Args:
+            name: Metric name without prefix
+            value: Observed value
+            help_text: Description used in the Prometheus export
+            **labels: Label values
+        """
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            key = self._label_key(labels)
+            histogram = series.setdefault(
+                key, {'count': 0, 'sum': 0.0, 'buckets': [0] * len(self.DEFAULT_BUCKETS)}
+            )
+            histogram['count'] += 1
+            histogram['sum'] += value
+            for i, bound in enumerate(self.DEFAULT_BUCKETS):
+                if value <= bound:
+                    histogram['buckets'][i] += 1
+            if help_text:
+                self._help.setdefault(name, help_text)
+
+    def record_result(self, result):
+        """
+        Aggregate a finished SummaryResult's timings and token usage.
+
+        Args:
+            result: SummaryResult returned by ResumeSummarizer
+        """
+        status = "cached" if result.cached else ("success" if result.success else "failure")
+        self.increment("documents_total", help_text="Documents processed", status=status)
+        if result.skipped_pages:
+            self.increment("pages_skipped_total", len(result.skipped_pages),
+                           help_text="PDF pages left unread by the extraction limits")
+        if result.reduction:
+            self.increment("input_chars_removed_total", result.reduction['chars_removed'],
+                           help_text="Extracted characters removed by the reduction stage")
+            self.increment("input_tokens_removed_total", result.reduction['tokens_removed'],
+                           help_text="Estimated prompt tokens saved by the reduction stage")
+        if result.duplicate_of is not None:
+            self.increment("near_duplicates_total", help_text="Documents matched to a near-duplicate CV",
+                           reused=result.success)
+
+        for stage, seconds in result.stage_timings.items():
+            self.observe("stage_seconds", seconds, help_text="Time spent per processing stage", stage=stage)
+
+        for call in result.llm_calls:
+            stage = call.get('stage', 'summarize')
+            self.increment("llm_calls_total", help_text="Model calls", stage=stage)
+            self.observe("llm_call_seconds", call.get('seconds', 0.0),
+                         help_text="Wall time per model call", stage=stage)
+            self.increment("prompt_tokens_total", call.get('prompt_eval_count') or 0,
+                           help_text="Prompt tokens evaluated by Ollama", stage=stage)
+            self.increment("prompt_tokens_estimated_total", call.get('prompt_tokens_estimate') or 0,
+                           help_text="Estimated prompt size before KV cache reuse", stage=stage)
+            self.increment("completion_tokens_total", call.get('eval_count') or 0,
+                           help_text="Tokens generated by Ollama", stage=stage)
+            self.increment("num_predict_saved_tokens_total", call.get('num_predict_saved') or 0,
+                           help_text="Decode budget saved by adaptive num_predict", stage=stage)
+            self.increment("discarded_tokens_total", call.get('discarded_tokens') or 0,
+                           help_text="Decoded tokens cut by the summary length rules", stage=stage)
+            if call.get('stopped_early'):
+                self.increment("early_stops_total", help_text="Streams stopped once the summary was complete",
+                               stage=stage)
+            for field in ('prompt_eval_duration', 'eval_duration', 'load_duration'):
+                self.increment(f"ollama_{field}_seconds_total", (call.get(field) or 0) / 1e9,
+                               help_text=f"Ollama-reported {field.replace('_', ' ')}", stage=stage)
+
+    def to_json(self) -> Dict[str, Any]:
+        """
+        Export all metrics as a JSON-serialisable dictionary.
+
+        Returns:
+            Dict[str, Any]: Counters and histograms keyed by metric name
+        """
+        with self._lock:
+            return {
+                'counters': {
+                    name: [{'labels': dict(key), 'value': value} for key, value in series.items()]
+                    for name, series in self._counters.items()
+                },
+                'histograms': {
+                    name: [
+                        {
+                            'labels': dict(key),
+                            'count': h['count'],
+                            'sum': h['sum'],
+                            'buckets': dict(zip(map(str, self.DEFAULT_BUCKETS), h['buckets'])),
+                        }
+                        for key, h in series.items()
+                    ]
+                    for name, series in self._histograms.items()
+                },
+            }
+
+    @staticmethod
+    def _format_labels(key: _LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+        pairs = list(key) + ([extra] if extra else [])
+        if not pairs:
+            return ""
+        escaped = (
+            f'{name}="{value.replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34))}"'
+            for name, value in pairs
+        )
+        return "{" + ",".join(escaped) + "}"
+
+    def to_prometheus(self) -> str:
+        """
+        Export all metrics in the Prometheus text exposition format.
+
+        Returns:
+            str: Prometheus text format
+        """
+        lines = []
+        with self._lock:
+            for name, series in sorted(self._counters.items()):
+                full_name = f"{self.prefix}_{name}"
+                lines.append(f"# HELP {full_name} {self._help.get(name, name)}")
+                lines.append(f"# TYPE {full_name} counter")
+                for key, value in series.items():
+                    lines.append(f"{full_name}{self._format_labels(key)} {value}")
+
+            for name, series in sorted(self._histograms.items()):
+                full_name = f"{self.prefix}_{name}"
+                lines.append(f"# HELP {full_name} {self._help.get(name, name)}")
+                lines.append(f"# TYPE {full_name} histogram")
+                for key, h in series.items():
+                    for bound, count in zip(self.DEFAULT_BUCKETS, h['buckets']):
+                        labels = self._format_labels(key, ('le', str(bound)))
+                        lines.append(f"{full_name}_bucket{labels} {count}")
+                    labels = self._format_labels(key, ('le', '+Inf'))
+                    lines.append(f"{full_name}_bucket{labels} {h['count']}")
+                    lines.append(f"{full_name}_sum{self._format_labels(key)} {h['sum']}")
+                    lines.append(f"{full_name}_count{self._format_labels(key)} {h['count']}")
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        """Drop all recorded metrics."""
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+
+# Shared by every summarizer in the process
+metrics_registry = MetricsRegistry()
+
+_metrics_servers: Dict[int, ThreadingHTTPServer] = {}
+_metrics_servers_lock = threading.Lock()
+
+
+def start_metrics_server(port: int, host: str = "127.0.0.1",
+                         registry: MetricsRegistry = metrics_registry) -> ThreadingHTTPServer:
+    """
+    Serve /metrics (Prometheus text) and /metrics.json on a background thread.
+
+    Calling it again for the same port returns the running server.
+
+    Args:
+        port: Port to listen on
+        host: Interface to bind; the default only accepts local scrapers
+        registry: Registry to export
+
+    Returns:
+        ThreadingHTTPServer: The running server
+    """
+    with _metrics_servers_lock:
+        if port in _metrics_servers:
+            return _metrics_servers[port]
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                if self.path == "/metrics":
+                    body = registry.to_prometheus().encode()
+                    content_type = "text/plain; version=0.0.4"
+                elif self.path == "/metrics.json":
+                    body = json.dumps(registry.to_json()).encode()
+                    content_type = "application/json"
+                else:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+        _metrics_servers[port] = server
+        return server
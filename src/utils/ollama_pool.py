@@ -0,0 +1,351 @@
+import asyncio
+import threading
+import time
+import weakref
+from concurrent.futures import CancelledError
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, List, Optional
+
+import httpx
+import ollama
+
+from src.utils.metrics import metrics_registry
+
+
+class NoHealthyEndpointError(RuntimeError):
+    """Raised when no healthy Ollama endpoint serves the requested model."""
+
+
+class OllamaEndpoint:
+    """One Ollama server with its clients, model inventory and load statistics."""
+
+    def __init__(self, base_url: str, timeout: float, pool_size: int, probe_timeout: float):
+        """
+        Initialize the endpoint.
+
+        Args:
+            base_url: Ollama server URL
+            timeout: Timeout for model calls in seconds
+            pool_size: Maximum pooled connections to the server
+            probe_timeout: Timeout for health probes in seconds
+        """
+        self.base_url = base_url
+        self.timeout = timeout
+        limits = httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size)
+        self.client = ollama.Client(host=base_url, timeout=timeout, limits=limits)
+        self.probe_client = ollama.Client(host=base_url, timeout=probe_timeout)
+        self.models: List[str] = []
+        self.models_expire = 0.0
+        self.healthy = True
+        self.ejected_until = 0.0
+        self.in_flight = 0
+        self.calls = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        # Exponentially weighted call latency in seconds, None until the first call
+        self.latency: Optional[float] = None
+
+    @asynccontextmanager
+    async def async_client(self) -> AsyncIterator[ollama.AsyncClient]:
+        """
+        A single-use asyncio client for the server, closed on exit.
+
+        Asyncio connections belong to one event loop, so unlike ``client``
+        these are not pooled. Cancelling the task using it aborts the request.
+
+        Yields:
+            ollama.AsyncClient: Client with its own connection
+        """
+        transport = httpx.AsyncHTTPTransport()
+        try:
+            yield ollama.AsyncClient(host=self.base_url, timeout=self.timeout, transport=transport)
+        finally:
+            await transport.aclose()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Snapshot of the endpoint's state.
+
+        Returns:
+            Dict with base_url, healthy, in_flight, calls, failures, latency_ms and models
+        """
+        return {
+            'base_url': self.base_url,
+            'healthy': self.healthy,
+            'in_flight': self.in_flight,
+            'calls': self.calls,
+            'failures': self.failures,
+            'latency_ms': round(self.latency * 1000, 1) if self.latency is not None else None,
+            'models': list(self.models),
+        }
+
+
+class OllamaPool:
+    """Routes model calls across several Ollama servers.
+
+    Each call goes to the healthy endpoint that has the model and the fewest
+    calls in flight, ties broken by lower recent latency. An endpoint failing
+    failure_threshold calls in a row is ejected for ejection_seconds and only
+    re-admitted once a health probe (listing its models) succeeds. The last
+    healthy endpoint is never ejected, so a single server behaves as before.
+    With more than one endpoint a background thread probes every
+    health_interval seconds, which also refreshes the model inventories.
+    """
+
+    def __init__(self, base_urls: Iterable[str], timeout: float = 60, pool_size: int = 10,
+                 health_interval: float = 10, failure_threshold: int = 3,
+                 ejection_seconds: float = 30, model_list_ttl: float = 30,
+                 probe_timeout: float = 5):
+        """
+        Initialize the pool.
+
+        Args:
+            base_urls: Ollama server URLs
+            timeout: Timeout for model calls in seconds
+            pool_size: Maximum pooled connections per server
+            health_interval: Seconds between background health probes (0 disables them)
+            failure_threshold: Consecutive failed calls that eject an endpoint
+            ejection_seconds: Minimum time an ejected endpoint receives no calls
+            model_list_ttl: Seconds a model inventory is trusted before it is listed again
+            probe_timeout: Timeout for health probes in seconds
+        """
+        self.endpoints = [
+            OllamaEndpoint(url.rstrip('/'), timeout, pool_size, probe_timeout)
+            for url in dict.fromkeys(base_urls)
+        ]
+        if not self.endpoints:
+            raise ValueError("At least one Ollama endpoint is required")
+        self.health_interval = health_interval
+        self.failure_threshold = max(1, failure_threshold)
+        self.ejection_seconds = ejection_seconds
+        self.model_list_ttl = model_list_ttl
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+        if len(self.endpoints) > 1 and health_interval > 0:
+            # The thread only holds a weak reference, so a discarded pool stops probing
+            threading.Thread(
+                target=self._probe_loop, args=(weakref.ref(self), self._stop, health_interval),
+                name="ollama-health", daemon=True
+            ).start()
+
+    @classmethod
+    def from_settings(cls, ollama_settings: Dict[str, Any]) -> "OllamaPool":
+        """
+        Build a pool from the ``ollama_settings`` section of the settings.
+
+        Args:
+            ollama_settings: Ollama settings; ``endpoints`` lists server URLs and
+                falls back to ``base_url``
+
+        Returns:
+            OllamaPool instance
+        """
+        endpoints = ollama_settings.get('endpoints') or [
+            ollama_settings.get('base_url', 'http://localhost:11434')
+        ]
+        return cls(
+            endpoints,
+            timeout=ollama_settings.get('timeout', 60),
+            pool_size=ollama_settings.get('pool_size', 10),
+            health_interval=ollama_settings.get('health_interval', 10),
+            failure_threshold=ollama_settings.get('failure_threshold', 3),
+            ejection_seconds=ollama_settings.get('ejection_seconds', 30),
+            model_list_ttl=ollama_settings.get('model_list_ttl', 30),
+        )
+
+    @property
+    def primary(self) -> OllamaEndpoint:
+        """The first configured endpoint."""
+        return self.endpoints[0]
+
+    @staticmethod
+    def _probe_loop(pool_ref, stop: threading.Event, interval: float):
+        while not stop.wait(interval):
+            pool = pool_ref()
+            if pool is None:
+                return
+            pool.probe_all()
+            del pool
+
+    def close(self):
+        """Stop background health probes."""
+        self._stop.set()
+
+    def probe(self, endpoint: OllamaEndpoint) -> bool:
+        """
+        Check an endpoint by listing its models, updating its inventory and health.
+
+        Args:
+            endpoint: Endpoint to probe
+
+        Returns:
+            bool: True if the endpoint answered
+        """
+        try:
+            models = [model.model for model in endpoint.probe_client.list().models]
+        except Exception:
+            with self._lock:
+                # A dead server is taken out of rotation right away, unless it is the last one
+                if endpoint.healthy and self._others_healthy(endpoint):
+                    self._eject(endpoint)
+            return False
+
+        with self._lock:
+            endpoint.models = models
+            endpoint.models_expire = time.monotonic() + self.model_list_ttl
+            if not endpoint.healthy and time.monotonic() >= endpoint.ejected_until:
+                endpoint.healthy = True
+                endpoint.consecutive_failures = 0
+                metrics_registry.increment("ollama_endpoint_readmissions_total",
+                                           help_text="Ejected Ollama endpoints re-admitted after a probe",
+                                           endpoint=endpoint.base_url)
+        return True
+
+    def probe_all(self):
+        """Probe every endpoint once."""
+        for endpoint in self.endpoints:
+            self.probe(endpoint)
+
+    def available_models(self) -> List[str]:
+        """
+        List the models served by at least one healthy endpoint.
+
+        Inventories older than model_list_ttl are refreshed first.
+
+        Returns:
+            List[str]: Model names, in endpoint order
+        """
+        now = time.monotonic()
+        for endpoint in self.endpoints:
+            if endpoint.models_expire <= now and (endpoint.healthy or now >= endpoint.ejected_until):
+                self.probe(endpoint)
+        with self._lock:
+            models = [m for endpoint in self.endpoints if endpoint.healthy for m in endpoint.models]
+        return list(dict.fromkeys(models))
+
+    def endpoints_for(self, model: str) -> List[OllamaEndpoint]:
+        """
+        Healthy endpoints that have a model.
+
+        Args:
+            model: Model name
+
+        Returns:
+            List[OllamaEndpoint]: Matching endpoints in configured order
+        """
+        with self._lock:
+            return [e for e in self.endpoints if e.healthy and model in e.models]
+
+    @contextmanager
+    def acquire(self, model: str, exclude: Iterable[str] = ()) -> Iterator[OllamaEndpoint]:
+        """
+        Pick the least-loaded healthy endpoint with a model for the duration of a call.
+
+        Exceptions raised in the with-block count as failures of the endpoint,
+        except Ollama errors with a 4xx status, which are the request's fault,
+        and CancelledError (from concurrent.futures or asyncio), raised by callers
+        abandoning the call (e.g. a lost hedge).
+
+        Args:
+            model: Model the call uses
+            exclude: Base URLs not to pick (e.g. endpoints that just failed this call)
+
+        Yields:
+            OllamaEndpoint: The chosen endpoint
+        """
+        if not any(model in e.models for e in self.endpoints):
+            # Inventories are empty until the first listing
+            self.available_models()
+
+        excluded = set(exclude)
+        with self._lock:
+            candidates = [
+                e for e in self.endpoints
+                if e.healthy and model in e.models and e.base_url not in excluded
+            ]
+            if not candidates and len(self.endpoints) == 1 and not excluded:
+                # A single server is always tried; let it report a missing model itself
+                candidates = list(self.endpoints)
+            if not candidates:
+                raise NoHealthyEndpointError(f"No healthy Ollama endpoint serves model {model}")
+            endpoint = min(
+                candidates,
+                key=lambda e: (e.in_flight, e.latency if e.latency is not None else 0.0)
+            )
+            endpoint.in_flight += 1
+
+        start_time = time.perf_counter()
+        outcome = "success"
+        try:
+            yield endpoint
+        except (CancelledError, asyncio.CancelledError):
+            outcome = "cancelled"
+            raise
+        except Exception as e:
+            outcome = "failure" if self.is_endpoint_failure(e) else "success"
+            raise
+        finally:
+            # Also reached when a streaming caller closes its generator early
+            self._record(endpoint, time.perf_counter() - start_time, outcome)
+
+    @staticmethod
+    def is_endpoint_failure(error: BaseException) -> bool:
+        """
+        Whether an error from a model call says something about the server's health.
+
+        Args:
+            error: Exception raised by the call
+
+        Returns:
+            bool: False for client errors such as an unknown model
+        """
+        status_code = getattr(error, 'status_code', None)
+        return not (isinstance(error, ollama.ResponseError) and status_code is not None
+                    and 400 <= status_code < 500)
+
+    def _record(self, endpoint: OllamaEndpoint, seconds: float, outcome: str):
+        with self._lock:
+            endpoint.in_flight -= 1
+            endpoint.calls += 1
+            if outcome == "cancelled":
+                # Cut short by the caller (e.g. a lost hedge): not a failure, but the call would
+                # have taken at least this long, so a slow endpoint's estimate still rises
+                if endpoint.latency is None or seconds > endpoint.latency:
+                    self._observe_latency(endpoint, seconds)
+            elif outcome == "failure":
+                endpoint.failures += 1
+                endpoint.consecutive_failures += 1
+                if (endpoint.healthy and endpoint.consecutive_failures >= self.failure_threshold
+                        and self._others_healthy(endpoint)):
+                    self._eject(endpoint)
+            else:
+                endpoint.consecutive_failures = 0
+                self._observe_latency(endpoint, seconds)
+        metrics_registry.increment("ollama_endpoint_calls_total", help_text="Model calls per Ollama endpoint",
+                                   endpoint=endpoint.base_url, outcome=outcome)
+        metrics_registry.observe("ollama_endpoint_call_seconds", seconds,
+                                 help_text="Model call duration per Ollama endpoint", endpoint=endpoint.base_url)
+
+    @staticmethod
+    def _observe_latency(endpoint: OllamaEndpoint, seconds: float):
+        endpoint.latency = seconds if endpoint.latency is None else 0.8 * endpoint.latency + 0.2 * seconds
+
+    def _others_healthy(self, endpoint: OllamaEndpoint) -> bool:
+        return any(e.healthy for e in self.endpoints if e is not endpoint)
+
+    def _eject(self, endpoint: OllamaEndpoint):
+        endpoint.healthy = False
+        endpoint.ejected_until = time.monotonic() + self.ejection_seconds
+        metrics_registry.increment("ollama_endpoint_ejections_total", help_text="Ollama endpoints ejected",
+                                   endpoint=endpoint.base_url)
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """
+        Per-endpoint health, load and latency.
+
+        Returns:
+            List[Dict[str, Any]]: One OllamaEndpoint.stats() snapshot per endpoint
+        """
+        with self._lock:
+            return [endpoint.stats() for endpoint in self.endpoints]
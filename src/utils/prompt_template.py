@@ -0,0 +1,127 @@
+import re
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Set
+
+
+_PLACEHOLDER = re.compile(r'\{(\w+)\}')
+
+# Prompts a summarizer uses: "summary" for single-call documents, "map" for
+# chunk summaries and "reduce" for merging them
+PROMPT_NAMES = ("summary", "map", "reduce")
+
+
+class PromptTemplate:
+    """A prompt parsed once into literal text and {placeholder} fields.
+
+    render() fills every field in a single pass over the parsed parts, so
+    inserted values are never scanned again: a CV containing "{max_length}"
+    stays as written. Placeholders without a value are left as they are.
+    """
+
+    def __init__(self, source: str):
+        """
+        Parse a template.
+
+        Args:
+            source: Template text with {name} placeholders
+        """
+        self.source = source
+        self._literals: List[str] = []
+        self._fields: List[str] = []
+        position = 0
+        for match in _PLACEHOLDER.finditer(source):
+            self._literals.append(source[position:match.start()])
+            self._fields.append(match.group(1))
+            position = match.end()
+        self._literals.append(source[position:])
+
+    @classmethod
+    def _from_parts(cls, literals: List[str], fields: List[str]) -> "PromptTemplate":
+        template = cls.__new__(cls)
+        template._literals = literals
+        template._fields = fields
+        template.source = template.render()
+        return template
+
+    @property
+    def fields(self) -> Set[str]:
+        """Names of the placeholders in the template."""
+        return set(self._fields)
+
+    def render(self, **values: Any) -> str:
+        """
+        Fill the placeholders.
+
+        Args:
+            **values: Placeholder values, converted with str()
+
+        Returns:
+            str: The rendered prompt
+        """
+        parts = [self._literals[0]]
+        for field, literal in zip(self._fields, self._literals[1:]):
+            parts.append(str(values[field]) if field in values else "{" + field + "}")
+            parts.append(literal)
+        return "".join(parts)
+
+    def bind(self, **values: Any) -> "PromptTemplate":
+        """
+        Fill some placeholders now and keep the others for render().
+
+        Used for values fixed by the settings (e.g. the summary length), so
+        each request only inserts the document.
+
+        Args:
+            **values: Placeholder values, converted with str()
+
+        Returns:
+            PromptTemplate: A new template without the bound placeholders
+        """
+        literals = [self._literals[0]]
+        fields = []
+        for field, literal in zip(self._fields, self._literals[1:]):
+            if field in values:
+                literals[-1] += str(values[field]) + literal
+            else:
+                fields.append(field)
+                literals.append(literal)
+        return self._from_parts(literals, fields)
+
+
+@lru_cache(maxsize=128)
+def compile_prompt(source: str) -> PromptTemplate:
+    """
+    Parse a template, reusing the parsed form for text seen before.
+
+    Args:
+        source: Template text with {name} placeholders
+
+    Returns:
+        PromptTemplate: The parsed template (shared, so never modified)
+    """
+    return PromptTemplate(source)
+
+
+def prompt_source(settings: Dict[str, Any], name: str = "summary", custom_prompt: Optional[str] = None) -> str:
+    """
+    Template text for a named prompt.
+
+    "summary" is the custom prompt or the settings' ``prompt``. "map" and
+    "reduce" come from the settings' ``prompts`` section and fall back to it.
+
+    Args:
+        settings: Application settings dictionary
+        name: One of PROMPT_NAMES
+        custom_prompt: Optional prompt replacing the settings' ``prompt``
+
+    Returns:
+        str: The template text
+    """
+    if name not in PROMPT_NAMES:
+        raise ValueError(f"Unknown prompt name: {name}")
+    source = custom_prompt or settings.get('prompt', '')
+    if name != "summary":
+        source = (settings.get('prompts') or {}).get(name) or source
+    if not source:
+        raise ValueError("No prompt configured in settings")
+    return source
@@ -2,6 +2,8 @@ import json
 import os
 from typing import Dict, Any, Optional
 
+from src.utils.prompt_template import PromptTemplate, compile_prompt, prompt_source
+
 
 class SettingsLoader:
     """Loads settings from external JSON file."""
@@ -15,23 +17,41 @@ class SettingsLoader:
         """
         self.settings_file = settings_file
         self._settings_cache = None
+        self._settings_mtime = None
+        # Compiled prompts of the loaded settings version, by prompt name
+        self._prompt_templates: Dict[str, PromptTemplate] = {}
     
     def load_settings(self) -> Dict[str, Any]:
         """
         Load settings from JSON file.
         
+        The file is only re-read when its modification time changes.
+        
         Returns:
             Dict[str, Any]: Loaded settings dictionary
         """
-        if self._settings_cache:
+        mtime = os.stat(self.settings_file).st_mtime_ns
+        if self._settings_cache and mtime == self._settings_mtime:
             return self._settings_cache
         
         with open(self.settings_file, 'r') as f:
             config = json.load(f)
         
         self._settings_cache = config
+        self._settings_mtime = mtime
+        self._prompt_templates = {}
         return config
     
+    def settings_version(self) -> int:
+        """
+        Get an identifier that changes whenever the settings file changes.
+        
+        Returns:
+            int: Modification time of the loaded settings file in nanoseconds
+        """
+        self.load_settings()
+        return self._settings_mtime
+    
     def get_prompt(self, settings: Dict[str, Any]) -> str:
         """
         Get the prompt from settings.
@@ -40,18 +60,35 @@ class SettingsLoader:
             settings: Current application settings dictionary
             
         Returns:
-            str: The prompt to use
+            str: The prompt to use, with {min_length} and {max_length} filled in
         """
-        prompt = settings.get('prompt', '')
-        
-        if not prompt:
-            raise ValueError("No prompt found in settings")
+        return self.get_prompt_template(settings).source
+    
+    def get_prompt_template(self, settings: Dict[str, Any], name: str = "summary") -> PromptTemplate:
+        """
+        Get a compiled prompt with the summary length filled in.
         
-        # Replace placeholders with actual values
-        min_length = settings.get('summary_settings', {}).get('min_length', 430)
-        max_length = settings.get('summary_settings', {}).get('max_length', 500)
+        Templates of the loaded settings are compiled once per settings version.
         
-        return prompt.replace("{min_length}", str(min_length)).replace("{max_length}", str(max_length))
+        Args:
+            settings: Current application settings dictionary
+            name: "summary", or "map"/"reduce" for the prompts section (falling back to prompt)
+            
+        Returns:
+            PromptTemplate: Template that only needs {document_text}
+        """
+        # Settings dictionaries not loaded by this loader are compiled without caching
+        cacheable = settings is self._settings_cache
+        template = self._prompt_templates.get(name) if cacheable else None
+        if template is None:
+            summary_settings = settings.get('summary_settings', {})
+            template = compile_prompt(prompt_source(settings, name)).bind(
+                min_length=summary_settings.get('min_length', 430),
+                max_length=summary_settings.get('max_length', 500)
+            )
+            if cacheable:
+                self._prompt_templates[name] = template
+        return template
     
     def get_summary_settings(self, settings: Dict[str, Any]) -> Dict[str, int]:
         """
@@ -92,9 +129,92 @@ class SettingsLoader:
             settings: Current application settings dictionary
             
         Returns:
-            Dict[str, Any]: Ollama settings (base_url, timeout)
+            Dict[str, Any]: Ollama settings (base_url or endpoints, timeout)
         """
         return settings.get('ollama_settings', {
             'base_url': 'http://localhost:11434',
             'timeout': 60
+        })
+    
+    def get_batch_settings(self, settings: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Get batch processing settings from configuration.
+        
+        Args:
+            settings: Current application settings dictionary
+            
+        Returns:
+            Dict[str, Any]: Batch settings (extract_workers, llm_workers, use_mmap)
+        """
+        return settings.get('batch_settings', {
+            'extract_workers': None,
+            'llm_workers': 2,
+            'use_mmap': False
+        })
+    
+    def get_metrics_settings(self, settings: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Get metrics export settings from configuration.
+        
+        Args:
+            settings: Current application settings dictionary
+            
+        Returns:
+            Dict[str, Any]: Metrics settings (host, port)
+        """
+        return settings.get('metrics_settings', {
+            'host': '127.0.0.1',
+            'port': None
+        })
+    
+    def get_job_settings(self, settings: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Get background job settings from configuration.
+        
+        Args:
+            settings: Current application settings dictionary
+            
+        Returns:
+            Dict[str, Any]: Job settings (workers, poll_interval, result_ttl)
+        """
+        return settings.get('job_settings', {
+            'workers': 2,
+            'poll_interval': 0.5,
+            'result_ttl': 3600
+        })
+    
+    def get_upload_settings(self, settings: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Get upload handling settings from configuration.
+        
+        Args:
+            settings: Current application settings dictionary
+            
+        Returns:
+            Dict[str, Any]: Upload settings (spool_threshold_mb, stale_temp_file_hours)
+        """
+        return settings.get('upload_settings', {
+            'spool_threshold_mb': 10,
+            'stale_temp_file_hours': 24
+        })
+    
+    def get_service_settings(self, settings: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Get HTTP service settings from configuration.
+        
+        Args:
+            settings: Current application settings dictionary
+            
+        Returns:
+            Dict[str, Any]: Service settings (host, port, batch_size, batch_wait_ms, queue_size,
+            max_batches, max_body_mb)
+        """
+        return settings.get('service_settings', {
+            'host': '127.0.0.1',
+            'port': 8080,
+            'batch_size': 4,
+            'batch_wait_ms': 20,
+            'queue_size': 32,
+            'max_batches': 2,
+            'max_body_mb': 10
         })
\ No newline at end of file
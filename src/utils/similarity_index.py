@@ -0,0 +1,301 @@
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, List, Optional
+
+
+_WORD = re.compile(r'\w+')
+_DIGIT = re.compile(r'\d')
+_MASK64 = (1 << 64) - 1
+
+
+class SimHasher:
+    """Incremental 64-bit SimHash over word shingles.
+
+    Text can be fed piece by piece as it streams out of preprocessing; words
+    and shingles spanning two pieces are handled. Words are lowercased and
+    digits masked, so CVs differing only in dates or phone numbers hash
+    (nearly) alike.
+    """
+
+    def __init__(self, shingle_size: int = 3):
+        """
+        Initialize the hasher.
+
+        Args:
+            shingle_size: Number of consecutive words per feature
+        """
+        self.shingle_size = max(1, shingle_size)
+        self._weights = [0] * 64
+        self._window: List[str] = []
+        self._partial_word = ""
+        self._features = 0
+
+    def update(self, text: str):
+        """
+        Add a piece of text.
+
+        Args:
+            text: Next piece of the document
+        """
+        text = self._partial_word + text
+        words = _WORD.findall(_DIGIT.sub('0', text.lower()))
+        # The last word may continue in the next piece
+        self._partial_word = words.pop() if words and _WORD.match(text[-1]) else ""
+        for word in words:
+            self._add_word(word)
+
+    def _add_word(self, word: str):
+        self._window.append(word)
+        if len(self._window) > self.shingle_size:
+            self._window.pop(0)
+        if len(self._window) == self.shingle_size:
+            self._add_feature(" ".join(self._window))
+
+    def _add_feature(self, feature: str):
+        value = int.from_bytes(hashlib.blake2b(feature.encode('utf-8'), digest_size=8).digest(), 'big')
+        weights = self._weights
+        for bit in range(64):
+            if value >> bit & 1:
+                weights[bit] += 1
+            else:
+                weights[bit] -= 1
+        self._features += 1
+
+    def digest(self) -> Optional[int]:
+        """
+        Finish hashing.
+
+        Returns:
+            Optional[int]: 64-bit signature, or None if the text had no words
+        """
+        if self._partial_word:
+            self._add_word(self._partial_word)
+            self._partial_word = ""
+        if not self._features and self._window:
+            # Shorter than one shingle: hash what there is
+            self._add_feature(" ".join(self._window))
+        if not self._features:
+            return None
+        return sum(1 << bit for bit, weight in enumerate(self._weights) if weight > 0)
+
+
+def simhash(pieces: Iterable[str], shingle_size: int = 3) -> Optional[int]:
+    """
+    SimHash a text given as one or more pieces.
+
+    Args:
+        pieces: Text pieces in document order
+        shingle_size: Number of consecutive words per feature
+
+    Returns:
+        Optional[int]: 64-bit signature, or None if the text had no words
+    """
+    hasher = SimHasher(shingle_size)
+    for piece in pieces:
+        hasher.update(piece)
+    return hasher.digest()
+
+
+class SimilarityIndex:
+    """On-disk index of SimHash signatures of summarized CVs.
+
+    A signature is split into max_distance + 1 bands. By the pigeonhole
+    principle any signature within max_distance bits of a query matches it
+    exactly in at least one band, so a lookup is a handful of indexed
+    equality queries plus a Hamming check on the few candidates, regardless
+    of how many CVs are indexed.
+    """
+
+    _SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS signatures ("
+        " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+        " simhash INTEGER NOT NULL,"
+        " params_key TEXT NOT NULL,"
+        " summary TEXT NOT NULL,"
+        " model_used TEXT NOT NULL,"
+        " source TEXT,"
+        " created REAL NOT NULL)",
+        "CREATE TABLE IF NOT EXISTS bands ("
+        " band INTEGER NOT NULL,"
+        " value INTEGER NOT NULL,"
+        " signature_id INTEGER NOT NULL)",
+        "CREATE INDEX IF NOT EXISTS bands_lookup ON bands (band, value)",
+        "CREATE INDEX IF NOT EXISTS bands_signature ON bands (signature_id)",
+        "CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value INTEGER NOT NULL)",
+    )
+
+    def __init__(self, directory: str, threshold: float = 0.95, max_entries: int = 500000,
+                 shingle_size: int = 3):
+        """
+        Initialize the index.
+
+        Args:
+            directory: Directory holding the index database
+            threshold: Minimum similarity (1 - Hamming distance / 64) counted as a near-duplicate
+            max_entries: Maximum number of indexed CVs; the oldest are dropped beyond it
+            shingle_size: Number of consecutive words per SimHash feature
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.db_path = os.path.join(directory, "similarity.sqlite3")
+        self.threshold = threshold
+        self.max_distance = max(0, min(63, int((1 - threshold) * 64)))
+        self.band_count = self.max_distance + 1
+        self.max_entries = max_entries
+        self.shingle_size = shingle_size
+        self._lock = threading.Lock()
+
+        # Unlike the summary cache, one connection is kept open: opening a
+        # connection costs more than the lookup itself
+        self._conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None,
+                                     check_same_thread=False)
+        with self._connect() as conn:
+            for statement in self._SCHEMA:
+                conn.execute(statement)
+            self._ensure_band_layout(conn)
+
+    @classmethod
+    def from_settings(cls, settings: Dict[str, Any]) -> Optional["SimilarityIndex"]:
+        """
+        Build an index from the ``similarity_settings`` section of the settings.
+
+        Args:
+            settings: Application settings dictionary
+
+        Returns:
+            SimilarityIndex instance, or None when near-duplicate detection is disabled
+        """
+        similarity_settings = settings.get('similarity_settings', {})
+        if not similarity_settings.get('enabled', False):
+            return None
+        return cls(
+            directory=settings.get('cache_settings', {}).get('directory', '.cache'),
+            threshold=similarity_settings.get('threshold', 0.95),
+            max_entries=similarity_settings.get('max_entries', 500000),
+            shingle_size=similarity_settings.get('shingle_size', 3),
+        )
+
+    @contextmanager
+    def _connect(self):
+        with self._lock:
+            yield self._conn
+
+    def hasher(self) -> SimHasher:
+        """Create an incremental hasher configured like this index."""
+        return SimHasher(self.shingle_size)
+
+    def _bands(self, signature: int) -> List[int]:
+        # Split the 64 bits into band_count nearly equal slices; a single band
+        # holds the whole signature, so values are stored signed like simhash
+        bounds = [64 * i // self.band_count for i in range(self.band_count + 1)]
+        return [
+            self._to_signed(signature >> start & ((1 << (end - start)) - 1))
+            for start, end in zip(bounds, bounds[1:])
+        ]
+
+    @staticmethod
+    def _to_signed(value: int) -> int:
+        # SQLite integers are signed 64-bit
+        return value - (1 << 64) if value >= 1 << 63 else value
+
+    def _ensure_band_layout(self, conn: sqlite3.Connection):
+        row = conn.execute("SELECT value FROM meta WHERE name = 'band_count'").fetchone()
+        if row is not None and row[0] == self.band_count:
+            return
+
+        # The threshold changed: re-band every stored signature
+        conn.execute("BEGIN")
+        conn.execute("DELETE FROM bands")
+        for signature_id, signature in conn.execute("SELECT id, simhash FROM signatures").fetchall():
+            self._insert_bands(conn, signature_id, signature & _MASK64)
+        conn.execute(
+            "INSERT OR REPLACE INTO meta VALUES ('band_count', ?)", (self.band_count,)
+        )
+        conn.execute("COMMIT")
+
+    def _insert_bands(self, conn: sqlite3.Connection, signature_id: int, signature: int):
+        conn.executemany(
+            "INSERT INTO bands VALUES (?, ?, ?)",
+            [(band, value, signature_id) for band, value in enumerate(self._bands(signature))]
+        )
+
+    def find(self, signature: int, params_key: str) -> Optional[Dict[str, Any]]:
+        """
+        Find the most similar indexed CV summarized with the same parameters.
+
+        Args:
+            signature: SimHash of the new CV
+            params_key: Key of the model, prompt and settings the summary must match
+
+        Returns:
+            Dict with summary, model_used, source and similarity, or None if nothing is close enough
+        """
+        clauses = " OR ".join("(b.band = ? AND b.value = ?)" for _ in range(self.band_count))
+        params = [item for band in enumerate(self._bands(signature)) for item in band]
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT DISTINCT s.simhash, s.summary, s.model_used, s.source "
+                "FROM bands b JOIN signatures s ON s.id = b.signature_id "
+                f"WHERE ({clauses}) AND s.params_key = ?",
+                params + [params_key]
+            ).fetchall()
+
+        best = None
+        for stored, summary, model_used, source in rows:
+            distance = bin((stored & _MASK64) ^ signature).count("1")
+            if distance <= self.max_distance and (best is None or distance < best[0]):
+                best = (distance, summary, model_used, source)
+        if best is None:
+            return None
+        return {
+            'summary': best[1],
+            'model_used': best[2],
+            'source': best[3],
+            'similarity': 1 - best[0] / 64,
+        }
+
+    def add(self, signature: int, params_key: str, summary: str, model_used: str,
+            source: Optional[str] = None):
+        """
+        Index a summarized CV.
+
+        Args:
+            signature: SimHash of the CV
+            params_key: Key of the model, prompt and settings used
+            summary: Generated summary
+            model_used: Model that produced it
+            source: Optional description of the document (e.g. file name)
+        """
+        with self._connect() as conn:
+            conn.execute("BEGIN")
+            try:
+                cursor = conn.execute(
+                    "INSERT INTO signatures (simhash, params_key, summary, model_used, source, created) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (self._to_signed(signature), params_key, summary, model_used, source, time.time())
+                )
+                self._insert_bands(conn, cursor.lastrowid, signature)
+
+                # Ids are increasing, so the oldest entries are those below the cut-off
+                cutoff = cursor.lastrowid - self.max_entries
+                if cutoff > 0:
+                    conn.execute("DELETE FROM bands WHERE signature_id <= ?", (cutoff,))
+                    conn.execute("DELETE FROM signatures WHERE id <= ?", (cutoff,))
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    def __len__(self) -> int:
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM signatures").fetchone()[0]
+
+    def clear(self):
+        """Remove every indexed CV."""
+        with self._connect() as conn:
+            conn.execute("DELETE FROM bands")
+            conn.execute("DELETE FROM signatures")
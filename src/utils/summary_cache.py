@@ -0,0 +1,221 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, BinaryIO, Dict, Optional, Union
+
+from src.components.summary_result import SummaryResult
+
+
+class SummaryCache:
+    """Persistent, size-bounded LRU cache of generated summaries.
+
+    Entries live in a SQLite database so they survive Streamlit reruns and
+    process restarts. Keys are content addressed: the hash of the uploaded
+    file bytes combined with everything that influences the model output.
+    """
+
+    _SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS entries ("
+        " key TEXT PRIMARY KEY,"
+        " summary TEXT NOT NULL,"
+        " model_used TEXT NOT NULL,"
+        " processing_time REAL NOT NULL,"
+        " size INTEGER NOT NULL,"
+        " created REAL NOT NULL,"
+        " last_access REAL NOT NULL)",
+        "CREATE INDEX IF NOT EXISTS entries_last_access ON entries (last_access)",
+        "CREATE TABLE IF NOT EXISTS stats (name TEXT PRIMARY KEY, value INTEGER NOT NULL)",
+    )
+
+    def __init__(self, directory: str, max_entries: int = 1000, max_size_mb: float = 50):
+        """
+        Initialize the summary cache.
+
+        Args:
+            directory: Directory holding the cache database
+            max_entries: Maximum number of cached summaries
+            max_size_mb: Maximum total size of cached summaries in megabytes
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.db_path = os.path.join(directory, "summaries.sqlite3")
+        self.max_entries = max_entries
+        self.max_bytes = int(max_size_mb * 1024 * 1024)
+        self._lock = threading.Lock()
+
+        with self._connect() as conn:
+            for statement in self._SCHEMA:
+                conn.execute(statement)
+
+    @classmethod
+    def from_settings(cls, settings: Dict[str, Any]) -> Optional["SummaryCache"]:
+        """
+        Build a cache from the ``cache_settings`` section of the settings.
+
+        Args:
+            settings: Application settings dictionary
+
+        Returns:
+            SummaryCache instance, or None when caching is disabled
+        """
+        cache_settings = settings.get('cache_settings', {})
+        if not cache_settings.get('enabled', False):
+            return None
+        return cls(
+            directory=cache_settings.get('directory', '.cache'),
+            max_entries=cache_settings.get('max_entries', 1000),
+            max_size_mb=cache_settings.get('max_size_mb', 50),
+        )
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def hash_file(file_path: Union[str, BinaryIO]) -> str:
+        """
+        Compute the SHA-256 digest of a file without loading it whole.
+
+        Args:
+            file_path: Path to the file, or a seekable binary file object
+                (read from the start and left where it was)
+
+        Returns:
+            str: Hex digest of the file contents
+        """
+        digest = hashlib.sha256()
+        if isinstance(file_path, str):
+            with open(file_path, 'rb') as f:
+                for block in iter(lambda: f.read(1024 * 1024), b''):
+                    digest.update(block)
+        else:
+            position = file_path.tell()
+            file_path.seek(0)
+            for block in iter(lambda: file_path.read(1024 * 1024), b''):
+                digest.update(block)
+            file_path.seek(position)
+        return digest.hexdigest()
+
+    @staticmethod
+    def make_key(content_hash: str, **params: Any) -> str:
+        """
+        Combine a content hash with generation parameters into a cache key.
+
+        Args:
+            content_hash: Hash of the source document
+            **params: JSON-serialisable parameters affecting the summary
+
+        Returns:
+            str: Hex digest identifying the cache entry
+        """
+        payload = json.dumps({'content': content_hash, **params}, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[SummaryResult]:
+        """
+        Look up a cached summary and refresh its recency.
+
+        Args:
+            key: Cache key from make_key
+
+        Returns:
+            Cached SummaryResult, or None on a miss
+        """
+        start_time = time.time()
+        with self._lock, self._connect() as conn:
+            row = conn.execute(
+                "SELECT summary, model_used FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self._increment(conn, 'misses')
+                return None
+            conn.execute("UPDATE entries SET last_access = ? WHERE key = ?", (time.time(), key))
+            self._increment(conn, 'hits')
+
+        return SummaryResult(
+            summary=row[0],
+            model_used=row[1],
+            processing_time=time.time() - start_time,
+            success=True,
+            cached=True
+        )
+
+    def put(self, key: str, result: SummaryResult):
+        """
+        Store a successful summary and evict least recently used entries.
+
+        Args:
+            key: Cache key from make_key
+            result: SummaryResult to store
+        """
+        if not result.success:
+            return
+
+        now = time.time()
+        size = len(result.summary.encode('utf-8'))
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, result.summary, result.model_used, result.processing_time, size, now, now)
+            )
+            self._evict(conn)
+
+    def _evict(self, conn: sqlite3.Connection):
+        count, total_size = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+        ).fetchone()
+        if count <= self.max_entries and total_size <= self.max_bytes:
+            return
+
+        evicted = 0
+        for key, size in conn.execute(
+            "SELECT key, size FROM entries ORDER BY last_access ASC"
+        ).fetchall():
+            if count <= self.max_entries and total_size <= self.max_bytes:
+                break
+            conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            count -= 1
+            total_size -= size
+            evicted += 1
+        self._increment(conn, 'evictions', evicted)
+
+    @staticmethod
+    def _increment(conn: sqlite3.Connection, name: str, amount: int = 1):
+        conn.execute(
+            "INSERT INTO stats VALUES (?, ?) "
+            "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+            (name, amount)
+        )
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get cache counters.
+
+        Returns:
+            Dict[str, int]: hits, misses, evictions, entries and size_bytes
+        """
+        with self._connect() as conn:
+            counters = dict(conn.execute("SELECT name, value FROM stats").fetchall())
+            entries, size = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+            ).fetchone()
+        return {
+            'hits': counters.get('hits', 0),
+            'misses': counters.get('misses', 0),
+            'evictions': counters.get('evictions', 0),
+            'entries': entries,
+            'size_bytes': size
+        }
+
+    def clear(self):
+        """Remove all cached summaries and reset counters."""
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM entries")
+            conn.execute("DELETE FROM stats")